@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGO: str = "HS256"
     JWT_EXPIRES_MINS: int = 30
+    JWT_REFRESH_EXPIRES_MINS: int = 1440
 
     # Email / verification
     SMTP_HOST: str | None = None
@@ -36,6 +37,63 @@ class Settings(BaseSettings):
     # Encryption
     ENCRYPTION_KEY: str  
 
+    # Seat availability cache
+    SEAT_CACHE_MAX_SHOWS: int = 2048
+    # rebuild a show's bitmap after this long to pick up other workers' writes
+    SEAT_CACHE_TTL_SECONDS: int = 30
+
+    # Seat holds
+    SEAT_HOLD_TTL_SECONDS: int = 600
+    SEAT_HOLD_SWEEP_INTERVAL_SECONDS: int = 30
+    SEAT_HOLD_SWEEP_BATCH_SIZE: int = 500
+
+    # Keyset pagination for list endpoints
+    PAGE_DEFAULT_LIMIT: int = 100
+    PAGE_MAX_LIMIT: int = 500
+
+    # Movie catalog cache; bounds how long other workers' writes can stay unseen
+    MOVIE_CATALOG_TTL_SECONDS: int = 300
+
+    # "Now showing" snapshot: how far ahead it lists shows, and how often it is
+    # rebuilt in full (in between, only changed shows/movies are re-queried)
+    NOW_SHOWING_DAYS: int = 14
+    NOW_SHOWING_REFRESH_SECONDS: int = 300
+
+    # Ticket price table held in process by the pricing engine
+    PRICE_CACHE_TTL_SECONDS: int = 60
+
+    # Serialized responses of hot list endpoints (app/core/response_cache.py)
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Response compression (app/core/http_middleware.py); smaller bodies are sent as is
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_LEVEL: int = 6
+
+    # Authenticated principals cached by get_current_principal
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt runs on a dedicated thread pool; requests beyond workers + queue get a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+
+    # Auth rate limits (app/core/rate_limit.py): sustained requests per minute and burst size
+    AUTH_IP_RATE_PER_MINUTE: float = 30
+    AUTH_IP_BURST: int = 10
+    LOGIN_ACCOUNT_RATE_PER_MINUTE: float = 5
+    LOGIN_ACCOUNT_BURST: int = 5
+    PASSWORD_RESET_ACCOUNT_RATE_PER_MINUTE: float = 1
+    PASSWORD_RESET_ACCOUNT_BURST: int = 3
+    RATE_LIMIT_COMPACT_SECONDS: int = 60
+
+    # Promotion code index; bounds how long other workers' writes can stay unseen
+    PROMOTION_CACHE_TTL_SECONDS: int = 300
+
+    # Checkout: "claim" locks/claims seats before writing the booking,
+    # "optimistic" writes everything and relies on uq_show_seat_taken
+    CHECKOUT_LOCK_MODE: str = "claim"
+
     class Config:
         env_file = ".env"
 
@@ -5,13 +5,18 @@ from sqlalchemy import select
 
 from app.models.user import User
 from app.core.db import get_session
-from app.core.security import decode_access_token
+from app.core.principals import Principal, lookup, remember
+from app.core.security import PasswordHashBusy, decode_access_token
+from app.core.tokens import TokenClaims, is_revoked
 
 
-async def get_current_user(
-   authorization: str = Header(None),
-   session: AsyncSession = Depends(get_session)
-) -> User:
+def _check_version(payload: dict, token_version: int | None) -> None:
+   # tokens issued before "ver" existed count as version 0
+   if payload.get("ver", 0) != (token_version or 0):
+       raise HTTPException(status_code=401, detail="Token has been revoked")
+
+
+def _token_payload(authorization: str | None) -> tuple[int, dict]:
    if not authorization or not authorization.startswith("Bearer "):
        raise HTTPException(
            status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,13 +33,76 @@ async def get_current_user(
    except JWTError:
        raise HTTPException(status_code=401, detail="Invalid token")
 
+   if is_revoked(int(user_id), payload.get("iat")):
+       raise HTTPException(status_code=401, detail="Token has been revoked")
+
+   return int(user_id), payload
 
-   result = await session.execute(select(User).where(User.user_id == int(user_id)))
+
+async def get_current_user(
+   authorization: str = Header(None),
+   session: AsyncSession = Depends(get_session)
+) -> User:
+   """The caller's ``User`` row, for endpoints that read or change more than the principal."""
+   user_id, payload = _token_payload(authorization)
+
+   result = await session.execute(select(User).where(User.user_id == user_id))
    user = result.scalar_one_or_none()
 
 
    if not user:
        raise HTTPException(status_code=404, detail="User not found")
 
-
+   _check_version(payload, user.token_version)
+   remember(user)
    return user
+
+
+async def _principal(user_id: int, session: AsyncSession) -> Principal:
+   principal = lookup(user_id)
+   if principal is not None:
+       return principal
+
+   user = await session.get(User, user_id)
+   if not user:
+       raise HTTPException(status_code=404, detail="User not found")
+
+   return remember(user)
+
+
+async def get_current_principal(
+   authorization: str = Header(None),
+   session: AsyncSession = Depends(get_session)
+) -> Principal:
+   """The caller's id, role, state, email and first name; no query on a cache hit."""
+   user_id, payload = _token_payload(authorization)
+   principal = await _principal(user_id, session)
+   _check_version(payload, principal.token_version)
+   return principal
+
+
+async def get_token_claims(
+   authorization: str = Header(None),
+   session: AsyncSession = Depends(get_session)
+) -> TokenClaims:
+   """The caller's id, role and state straight from the token; no query for tokens that carry them."""
+   user_id, payload = _token_payload(authorization)
+   if "role" in payload:
+       return TokenClaims(user_id=user_id, role=payload["role"], state=payload.get("state"))
+
+   # tokens issued before role/state claims existed
+   principal = await _principal(user_id, session)
+   _check_version(payload, principal.token_version)
+   return TokenClaims(user_id=user_id, role=principal.role, state=principal.state)
+
+
+async def pooled_hash(hashing):
+   """Await a pooled bcrypt call; a full pool becomes 503 with Retry-After."""
+   try:
+       return await hashing
+   except PasswordHashBusy:
+       raise HTTPException(
+           status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+           detail="Server is busy, please retry shortly",
+           headers={"Retry-After": "1"},
+       )
@@ -0,0 +1,27 @@
+from hashlib import blake2b
+
+from fastapi import Request, Response
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag derived from the response bytes, so every worker agrees on it."""
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag`` (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve pre-serialized JSON, or an empty 304 if the client already has this version."""
+    # no-cache: clients may store the body but must revalidate it with the ETag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
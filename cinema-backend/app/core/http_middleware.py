@@ -0,0 +1,220 @@
+"""
+ASGI middleware for conditional requests and response compression.
+
+``ETagMiddleware`` gives every successful GET/HEAD response that lacks an
+ETag one derived from its body (``body_etag``) and answers a matching
+``If-None-Match`` with an empty 304. Endpoints that already set an ETag, such
+as the pre-serialized caches, are left alone.
+
+``CompressionMiddleware`` gzips or deflates bodies of at least
+``COMPRESSION_MIN_BYTES`` when the client accepts it and the content type is
+textual. A compressed body's ETag is made weak (``W/"..."``): the
+representation differs byte-wise but is semantically the same, and weak
+comparison still matches on revalidation.
+
+Both only buffer single-message bodies; streamed responses pass through
+untouched. Per-route counts of bytes before and after compression and of 304s
+are kept in ``stats`` and served at ``GET /healthcheck/http``. Requests
+that match no route are counted together under ``"<unmatched>"``.
+"""
+from __future__ import annotations
+
+import time
+import zlib
+from dataclasses import asdict, dataclass
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.http_cache import body_etag, etag_matches
+
+_COMPRESSIBLE = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+@dataclass(slots=True)
+class RouteStats:
+    responses: int = 0
+    compressed: int = 0
+    not_modified: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    compress_ms: float = 0.0
+
+
+# "METHOD /route/{template}" -> stats
+_stats: dict[str, RouteStats] = {}
+
+# raw paths and methods that match no route are chosen by the client, so they
+# share one entry instead of growing _stats without bound
+UNMATCHED = "<unmatched>"
+
+
+def _matched_route(scope: Scope):
+    # FastAPI routes put themselves in the scope; plain Starlette routes
+    # (/openapi.json, /docs) only leave their endpoint
+    route = scope.get("route")
+    if route is None and "endpoint" in scope and "app" in scope:
+        route = next((r for r in scope["app"].routes if getattr(r, "endpoint", None) is scope["endpoint"]), None)
+    return route
+
+
+def _route_key(scope: Scope) -> str:
+    route = _matched_route(scope)
+    path = getattr(route, "path", None)
+    methods = getattr(route, "methods", None)
+    if path is None or (methods and scope["method"] not in methods):
+        return UNMATCHED
+    return f"{scope['method']} {path}"
+
+
+def _record(scope: Scope) -> RouteStats:
+    key = _route_key(scope)
+    entry = _stats.get(key)
+    if entry is None:
+        entry = _stats[key] = RouteStats()
+    return entry
+
+
+def stats() -> dict[str, dict]:
+    """Per-route counters plus the bytes compression saved, largest savings first."""
+    rows = {}
+    for key, entry in _stats.items():
+        rows[key] = {**asdict(entry), "bytes_saved": entry.bytes_in - entry.bytes_out}
+    return dict(sorted(rows.items(), key=lambda item: -item[1]["bytes_saved"]))
+
+
+def reset_stats() -> None:
+    _stats.clear()
+
+
+class _Buffered:
+    """Collects a response whose body arrives in one message, else streams it through."""
+
+    def __init__(self, send: Send):
+        self.send = send
+        self.start: Message | None = None
+        self.streaming = False
+
+    async def capture(self, message: Message) -> Message | None:
+        """Return the final body message once the whole response is known."""
+        if message["type"] == "http.response.start":
+            self.start = message
+            return None
+        if self.streaming:
+            await self.send(message)
+            return None
+        if message.get("more_body", False):
+            self.streaming = True
+            await self.send(self.start)
+            await self.send(message)
+            return None
+        return message
+
+
+class ETagMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        buffered = _Buffered(send)
+
+        async def send_with_etag(message: Message) -> None:
+            body_message = await buffered.capture(message)
+            if body_message is None:
+                return
+            start = buffered.start
+            headers = MutableHeaders(scope=start)
+            if start["status"] == 200 and "etag" not in headers:
+                headers["ETag"] = body_etag(body_message.get("body", b""))
+            etag = headers.get("etag")
+            if start["status"] == 200 and etag and etag_matches(if_none_match, etag):
+                kept = [(name, value) for name, value in start["headers"] if name not in (b"content-length", b"content-type")]
+                await send({"type": "http.response.start", "status": 304, "headers": kept})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send(body_message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def _pick_encoding(accept_encoding: str) -> str | None:
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in ("gzip", "deflate"):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    level = settings.COMPRESSION_LEVEL
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _pick_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        buffered = _Buffered(send)
+
+        async def send_compressed(message: Message) -> None:
+            body_message = await buffered.capture(message)
+            if body_message is None:
+                return
+            start = buffered.start
+            body = body_message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            entry = _record(scope)
+            entry.responses += 1
+            entry.bytes_in += len(body)
+            if start["status"] == 304:
+                entry.not_modified += 1
+
+            if (
+                encoding
+                and len(body) >= settings.COMPRESSION_MIN_BYTES
+                and "content-encoding" not in headers
+                and headers.get("content-type", "").startswith(_COMPRESSIBLE)
+            ):
+                started = time.perf_counter()
+                compressed = _compress(body, encoding)
+                entry.compress_ms += (time.perf_counter() - started) * 1000
+                if len(compressed) < len(body):
+                    body = compressed
+                    entry.compressed += 1
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    etag = headers.get("etag")
+                    if etag and not etag.startswith("W/"):
+                        headers["ETag"] = f"W/{etag}"
+            headers.add_vary_header("Accept-Encoding")
+            entry.bytes_out += len(body)
+            await send(start)
+            await send({**body_message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,94 @@
+"""
+Keyset pagination shared by the list endpoints.
+
+List responses stay plain JSON arrays, and without ``?limit=`` or ``?cursor=``
+they hold the whole list, as before pagination existed. A paged request gets
+at most ``limit`` rows (``PAGE_DEFAULT_LIMIT`` when only a cursor is given).
+When more rows follow, the response carries an ``X-Next-Cursor`` header; pass
+it back as ``?cursor=`` to get the next page. The cursor is an opaque token
+wrapping the last integer key served, so every page is an index range scan
+(``WHERE key > :after ORDER BY key LIMIT n``) and costs the same however deep
+the client pages.
+"""
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from typing import Callable, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(after: int) -> str:
+    raw = json.dumps({"after": after}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(raw)["after"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        after = None
+    if type(after) is not int:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+    return after
+
+
+class Page:
+    """One requested page: the decoded cursor, the limit (None for all) and the response to annotate."""
+
+    def __init__(self, response: Response, after: int | None, limit: int | None):
+        self.response = response
+        self.after = after
+        self.limit = limit
+
+    def apply(self, stmt, column, descending: bool = False):
+        """Restrict ``stmt`` to this page, ordered by the unique ``column``."""
+        if self.after is not None:
+            stmt = stmt.where(column < self.after if descending else column > self.after)
+        stmt = stmt.order_by(column.desc() if descending else column)
+        if self.limit is None:
+            return stmt
+        # one extra row tells whether another page follows
+        return stmt.limit(self.limit + 1)
+
+    def finish(self, rows: Sequence[T], key: Callable[[T], int]) -> list[T]:
+        """Trim the look-ahead row and set the next-page cursor header if there is one."""
+        rows = list(rows)
+        if self.limit is not None and len(rows) > self.limit:
+            rows = rows[:self.limit]
+            self.set_next(key(rows[-1]))
+        return rows
+
+    def set_next(self, after: int, response: Response | None = None) -> None:
+        (response or self.response).headers[NEXT_CURSOR_HEADER] = encode_cursor(after)
+
+
+def paginate(
+    response: Response,
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int | None = Query(
+        None, ge=1, le=settings.PAGE_MAX_LIMIT, description="Page size; omit it and cursor for the whole list"
+    ),
+) -> Page:
+    if cursor:
+        return Page(response, decode_cursor(cursor), limit or settings.PAGE_DEFAULT_LIMIT)
+    return Page(response, None, limit)
+
+
+def page_of_sorted(keys: Sequence[int], page: Page) -> tuple[int, int, int | None]:
+    """
+    Slice bounds of ``page`` over ascending in-memory ``keys``:
+    (start, stop, next cursor key or None).
+    """
+    start = bisect_right(keys, page.after) if page.after is not None else 0
+    stop = len(keys) if page.limit is None else min(start + page.limit, len(keys))
+    return start, stop, keys[stop - 1] if stop < len(keys) else None
+
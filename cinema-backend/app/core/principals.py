@@ -0,0 +1,93 @@
+"""
+Cache of authenticated principals.
+
+Most authenticated endpoints only need to know who the caller is: id, role,
+state and the name/email used in notifications. ``get_current_principal``
+resolves a bearer token to a ``Principal`` from this cache, keyed by user id,
+and only reads ``users`` on a miss. Entries live for
+``PRINCIPAL_CACHE_TTL_SECONDS``. The user endpoints that change a user's
+state, role, profile or password, or delete the user, call
+``invalidate_principal`` after committing.
+
+The cache is per process, so the TTL also bounds how long another worker's
+change can go unseen. Hit/miss counts are served at
+``GET /healthcheck/principals``.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(slots=True, frozen=True)
+class Principal:
+    user_id: int
+    email: str
+    first_name: str
+    role: str | None
+    state: str | None
+    token_version: int = 0
+
+
+# user_id -> (principal, expires at)
+_principals: dict[int, tuple[Principal, float]] = {}
+_hits = 0
+_misses = 0
+_invalidations = 0
+
+
+def principal_of(user: User) -> Principal:
+    return Principal(
+        user_id=user.user_id,
+        email=user.email,
+        first_name=user.first_name,
+        role=getattr(user.role, "value", user.role),
+        state=getattr(user.state, "value", user.state),
+        token_version=user.token_version or 0,
+    )
+
+
+def lookup(user_id: int) -> Principal | None:
+    global _hits, _misses
+    entry = _principals.get(user_id)
+    if entry is not None and entry[1] > time.monotonic():
+        _hits += 1
+        return entry[0]
+    _misses += 1
+    return None
+
+
+def remember(user: User) -> Principal:
+    principal = principal_of(user)
+    if len(_principals) >= settings.PRINCIPAL_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for user_id in [uid for uid, (_, expires) in _principals.items() if expires <= now]:
+            del _principals[user_id]
+        if len(_principals) >= settings.PRINCIPAL_CACHE_MAX_ENTRIES:
+            _principals.clear()
+    _principals[principal.user_id] = (principal, time.monotonic() + settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    global _invalidations
+    if _principals.pop(user_id, None) is not None:
+        _invalidations += 1
+
+
+def clear() -> None:
+    _principals.clear()
+
+
+def stats() -> dict:
+    lookups = _hits + _misses
+    return {
+        "size": len(_principals),
+        "hits": _hits,
+        "misses": _misses,
+        "invalidations": _invalidations,
+        "hit_rate": round(_hits / lookups, 4) if lookups else None,
+    }
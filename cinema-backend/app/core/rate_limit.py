@@ -0,0 +1,106 @@
+"""
+In-process admission control for expensive routes.
+
+Each ``TokenBucket`` limits one kind of key (client IP, account email) to
+``rate`` requests per minute with bursts of up to ``burst``. Buckets are kept
+in GCRA form: one float per key, the time at which the bucket would be full
+again, instead of a (tokens, last refill) pair. Keys whose bucket has
+refilled completely carry no information and are dropped by a compaction
+pass every ``RATE_LIMIT_COMPACT_SECONDS``, so memory tracks only the
+currently throttled clients.
+
+``enforce`` checks all given buckets before consuming from any of them and
+raises 429 with ``Retry-After``; call it (or use ``limit_ip`` as a dependency)
+before any query or bcrypt work. Counts of allowed and rejected requests per
+bucket are served at ``GET /healthcheck/rate-limits``.
+
+Limits are per worker process, and the client IP is the socket peer; behind a
+proxy that does not rewrite it, all clients share the proxy's bucket.
+"""
+from __future__ import annotations
+
+import math
+import time
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate_per_minute: float, burst: int):
+        self.name = name
+        self._interval = 60.0 / rate_per_minute
+        # how far ahead of now the bucket may be booked before it runs dry
+        self._tolerance = self._interval * (burst - 1)
+        self._full_at: dict[str, float] = {}
+        self._compacted_at = time.monotonic()
+        self.allowed = 0
+        self.rejected = 0
+
+    def retry_after(self, key: str, now: float) -> float:
+        """Seconds until ``key`` may proceed; 0 if it may now."""
+        full_at = self._full_at.get(key, now)
+        return max(full_at - now - self._tolerance, 0.0)
+
+    def consume(self, key: str, now: float) -> None:
+        self._full_at[key] = max(self._full_at.get(key, now), now) + self._interval
+        self.allowed += 1
+        if now - self._compacted_at > settings.RATE_LIMIT_COMPACT_SECONDS:
+            self.compact(now)
+
+    def compact(self, now: float) -> None:
+        self._full_at = {key: full_at for key, full_at in self._full_at.items() if full_at > now}
+        self._compacted_at = now
+
+    def reset(self) -> None:
+        self._full_at.clear()
+        self.allowed = self.rejected = 0
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "rejected": self.rejected, "tracked_keys": len(self._full_at)}
+
+
+auth_ip = TokenBucket("auth_ip", settings.AUTH_IP_RATE_PER_MINUTE, settings.AUTH_IP_BURST)
+login_account = TokenBucket("login_account", settings.LOGIN_ACCOUNT_RATE_PER_MINUTE, settings.LOGIN_ACCOUNT_BURST)
+password_reset_account = TokenBucket(
+    "password_reset_account",
+    settings.PASSWORD_RESET_ACCOUNT_RATE_PER_MINUTE,
+    settings.PASSWORD_RESET_ACCOUNT_BURST,
+)
+BUCKETS = (auth_ip, login_account, password_reset_account)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def account_key(email: str) -> str:
+    return email.strip().casefold()
+
+
+def enforce(*checks: tuple[TokenBucket, str]) -> None:
+    """Admit the request against every (bucket, key) pair, or raise 429 without consuming any."""
+    now = time.monotonic()
+    for bucket, key in checks:
+        wait = bucket.retry_after(key, now)
+        if wait > 0:
+            bucket.rejected += 1
+            raise HTTPException(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Too many attempts, please try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+    for bucket, key in checks:
+        bucket.consume(key, now)
+
+
+def limit_ip(bucket: TokenBucket):
+    """Dependency that admits a request against ``bucket`` keyed by client IP."""
+    def dependency(request: Request) -> None:
+        enforce((bucket, client_ip(request)))
+    return dependency
+
+
+def stats() -> dict[str, dict]:
+    return {bucket.name: bucket.stats() for bucket in BUCKETS}
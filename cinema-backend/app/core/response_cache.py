@@ -0,0 +1,116 @@
+"""
+Cache of serialized JSON responses for hot read endpoints.
+
+``cached_json`` keys a response by request path and sorted query string and
+stores the final body bytes, ETag and any headers the endpoint set (such as
+``X-Next-Cursor``). A hit returns those bytes without loading rows or running
+Pydantic. Each entry carries tags ("shows", "showrooms", ...) and write routes
+call ``invalidate`` with the tags they affect after committing.
+
+Like the other in-process caches, entries also expire after
+``RESPONSE_CACHE_TTL_SECONDS`` so writes made by other workers show up, and the
+cache holds at most ``RESPONSE_CACHE_MAX_ENTRIES`` responses (least recently
+used are evicted first).
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.http_cache import body_etag, cached_json_response
+
+# headers of the endpoint's own response that are not worth replaying
+_SKIP_HEADERS = {"content-length", "content-type"}
+
+
+@dataclass(slots=True, frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: tuple[tuple[str, str], ...]
+    tags: frozenset[str]
+    stored_at: float
+
+
+_entries: OrderedDict[str, CachedResponse] = OrderedDict()
+_tagged: dict[str, set[str]] = {}
+# bumped by every invalidation; a response built across one is not stored
+_generation = 0
+
+
+def cache_key(request: Request) -> str:
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _drop(key: str) -> None:
+    entry = _entries.pop(key, None)
+    if entry is not None:
+        for tag in entry.tags:
+            keys = _tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+
+
+async def cached_json(
+    request: Request,
+    tags: Iterable[str],
+    adapter: TypeAdapter,
+    load: Callable[[], Awaitable[Any]],
+    response: Response | None = None,
+) -> Response:
+    """
+    Serve the cached response for ``request``, or build it: ``load`` returns
+    the data (ORM rows are fine), which is validated and serialized once
+    through ``adapter``. Headers set on ``response`` while loading are cached
+    and replayed with the body.
+    """
+    key = cache_key(request)
+    entry = _entries.get(key)
+    if entry is not None and time.monotonic() - entry.stored_at > settings.RESPONSE_CACHE_TTL_SECONDS:
+        _drop(key)
+        entry = None
+
+    if entry is None:
+        started_at = _generation
+        data = await load()
+        body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        headers = ()
+        if response is not None:
+            headers = tuple((name, value) for name, value in response.headers.items() if name not in _SKIP_HEADERS)
+        entry = CachedResponse(body, body_etag(body), headers, frozenset(tags), time.monotonic())
+        if started_at == _generation:
+            if len(_entries) >= settings.RESPONSE_CACHE_MAX_ENTRIES:
+                _drop(next(iter(_entries)))
+            _entries[key] = entry
+            for tag in entry.tags:
+                _tagged.setdefault(tag, set()).add(key)
+    else:
+        _entries.move_to_end(key)
+
+    served = cached_json_response(request, entry.body, entry.etag)
+    for name, value in entry.headers:
+        served.headers[name] = value
+    return served
+
+
+def invalidate(*tags: str) -> None:
+    """Drop every cached response carrying any of ``tags``."""
+    global _generation
+    _generation += 1
+    for tag in tags:
+        for key in _tagged.pop(tag, set()):
+            _drop(key)
+
+
+def clear() -> None:
+    global _generation
+    _generation += 1
+    _entries.clear()
+    _tagged.clear()
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import jwt, JWTError
@@ -13,19 +17,74 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# bcrypt takes ~200 ms of CPU and releases the GIL, so request handlers run it
+# on a small dedicated pool instead of blocking the event loop. At most
+# PASSWORD_HASH_WORKERS hashes run at once and PASSWORD_HASH_QUEUE_LIMIT more
+# may wait; beyond that callers get PasswordHashBusy rather than an
+# ever-growing backlog.
+_hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_in_flight = 0
+_hash_lock = threading.Lock()
+
+
+class PasswordHashBusy(RuntimeError):
+    """The password hashing pool is full; the caller should retry shortly."""
+
+
+def _release_hash_slot(_future) -> None:
+    global _hash_in_flight
+    with _hash_lock:
+        _hash_in_flight -= 1
+
+async def _run_hash(fn, *args):
+    global _hash_in_flight
+    with _hash_lock:
+        if _hash_in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT:
+            raise PasswordHashBusy("Too many password hashes in flight")
+        _hash_in_flight += 1
+    future = _hash_pool.submit(fn, *args)
+    # the slot is freed when the hash finishes, not when the caller stops
+    # waiting: a disconnected client's bcrypt call still occupies a worker
+    future.add_done_callback(_release_hash_slot)
+    return await asyncio.wrap_future(future)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
 
 #JWT token
-def create_access_token(subject: str | int) -> str:
+def _claim(value):
+    return getattr(value, "value", value)
+
+def create_access_token(subject: str | int, role=None, state=None, version: int = 0) -> str:
+    """Short-lived token; ``role`` and ``state`` ride along so routes can authorize without a lookup."""
     expires = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_EXPIRES_MINS)
-    payload = {"sub": str(subject), "exp": expires}
+    payload = {"sub": str(subject), "exp": expires, "iat": time.time(), "typ": "access", "ver": version}
+    if role is not None:
+        payload["role"] = _claim(role)
+    if state is not None:
+        payload["state"] = _claim(state)
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGO)
 
+def create_refresh_token(subject: str | int, jti: str, expires: datetime, version: int = 0) -> str:
+    payload = {"sub": str(subject), "exp": expires, "iat": time.time(), "typ": "refresh", "ver": version, "jti": jti}
+    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGO)
+
+def _decode(token: str, token_type: str) -> dict:
+    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
+    # tokens issued before "typ" existed are access tokens
+    if payload.get("typ", "access") != token_type:
+        raise JWTError(f"Expected a {token_type} token")
+    return payload
+
 def decode_access_token(token: str) -> dict:
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
-        return payload
-    except JWTError:
-        raise
+    return _decode(token, "access")
+
+def decode_refresh_token(token: str) -> dict:
+    return _decode(token, "refresh")
 
 #Credit card encryption
 fernet = Fernet(settings.ENCRYPTION_KEY.encode())
@@ -33,4 +92,28 @@ def encrypt_data(card_number: str) -> str:
     return fernet.encrypt(card_number.encode()).decode()
 
 def decrypt_data(encrypted_card_number: str) -> str:
-    return fernet.decrypt(encrypted_card_number.encode()).decode()
\ No newline at end of file
+    return fernet.decrypt(encrypted_card_number.encode()).decode()
+
+# non-sensitive display fields, stored next to the encrypted number
+_BRANDS = (
+    ("amex", ("34", "37")),
+    ("visa", ("4",)),
+    ("mastercard", tuple(str(n) for n in range(51, 56)) + tuple(str(n) for n in range(2221, 2721))),
+    ("discover", ("6011", "65") + tuple(str(n) for n in range(644, 650))),
+    ("diners", ("36", "38") + tuple(str(n) for n in range(300, 306))),
+    ("jcb", tuple(str(n) for n in range(3528, 3590))),
+)
+
+def card_digits(card_number: str) -> str:
+    return "".join(ch for ch in str(card_number) if ch.isdigit())
+
+def card_last_four(card_number: str) -> str | None:
+    digits = card_digits(card_number)
+    return digits[-4:] if len(digits) >= 4 else None
+
+def card_brand(card_number: str) -> str | None:
+    digits = card_digits(card_number)
+    for brand, prefixes in _BRANDS:
+        if digits.startswith(prefixes):
+            return brand
+    return None
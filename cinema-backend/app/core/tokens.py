@@ -0,0 +1,97 @@
+"""
+Access-token claims and revocation.
+
+Access tokens carry the user's ``role`` and ``state`` next to ``sub``, so
+authorization checks that only need those (admin routes, "is this my order")
+read them from the token with ``get_token_claims`` and never touch ``users``.
+
+A token's claims are only as fresh as the moment it was issued. When a
+user's state or password changes, ``bump_token_version`` increments
+``users.token_version`` in the same transaction. Every token carries the
+version it was issued under as ``ver``. ``/auth/refresh`` and the
+dependencies that read the user (``get_current_user``, and
+``get_current_principal`` once its cache entry expires) refuse older
+versions, so this revocation survives restarts and reaches every worker.
+
+``get_token_claims`` reads no row. On the worker that made the change,
+``revoke_tokens`` refuses every earlier token of that user right away.
+Other workers keep accepting an old access token until it expires
+(``JWT_EXPIRES_MINS``).
+
+Refresh tokens are single use. Each one has a row in ``refresh_tokens`` that
+``redeem_refresh_token`` deletes, and ``issue_refresh_token`` writes the
+replacement.
+"""
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+@dataclass(slots=True, frozen=True)
+class TokenClaims:
+    user_id: int
+    role: str | None
+    state: str | None
+
+
+# user_id -> wall-clock time; tokens issued before it are revoked
+_revoked_before: dict[int, float] = {}
+_compacted_at = time.time()
+
+
+def revoke_tokens(user_id: int) -> None:
+    global _compacted_at
+    now = time.time()
+    _revoked_before[user_id] = now
+    # once every token issued before a revocation has expired, it can be forgotten
+    horizon = settings.JWT_REFRESH_EXPIRES_MINS * 60
+    if now - _compacted_at > horizon:
+        for uid in [uid for uid, revoked_at in _revoked_before.items() if now - revoked_at > horizon]:
+            del _revoked_before[uid]
+        _compacted_at = now
+
+
+def is_revoked(user_id: int, issued_at: float | None) -> bool:
+    revoked_at = _revoked_before.get(user_id)
+    if revoked_at is None:
+        return False
+    return issued_at is None or issued_at < revoked_at
+
+
+def clear() -> None:
+    _revoked_before.clear()
+
+
+def bump_token_version(user: User) -> None:
+    """Invalidate every token issued to ``user`` so far; persisted by the caller's commit."""
+    user.token_version = (user.token_version or 0) + 1
+
+
+async def issue_refresh_token(db: AsyncSession, user: User) -> str:
+    """Record and return a new refresh token for ``user``; the caller commits."""
+    now = datetime.now(timezone.utc)
+    # tokens that expired unused are dropped here rather than by a sweeper
+    await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user.user_id, RefreshToken.expires_at <= now))
+    jti = str(uuid.uuid4())
+    expires = now + timedelta(minutes=settings.JWT_REFRESH_EXPIRES_MINS)
+    db.add(RefreshToken(jti=jti, user_id=user.user_id, expires_at=expires))
+    return create_refresh_token(user.user_id, jti, expires, version=user.token_version or 0)
+
+
+async def redeem_refresh_token(db: AsyncSession, user_id: int, jti: str | None) -> bool:
+    """Consume the refresh token ``jti``; False if it was already used or never issued."""
+    if not jti:
+        return False
+    result = await db.execute(delete(RefreshToken).where(RefreshToken.jti == jti, RefreshToken.user_id == user_id))
+    return result.rowcount == 1
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.routers.health import router as health_router
 from app.routers.movies import router as movie_router
@@ -10,16 +13,34 @@ from app.routers.showroom import router as showroom_router
 from app.routers.show import router as show_router
 from app.routers.seat import router as seat_router
 from app.routers.promotions import router as promotions_router
+from app.routers.promotions import public_router as promotions_public_router
 from app.routers.price import router as price_router
 from app.routers.orders import router as orders_router
 from app.routers.orders import router as orders_router
+from app.routers.now_showing import router as now_showing_router
+
+
+from app.core.http_middleware import CompressionMiddleware, ETagMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.services.seat_holds import run_hold_sweeper
 
 
 from fastapi.middleware.cors import CORSMiddleware
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # release expired seat holds in the background
+    hold_sweeper = asyncio.create_task(run_hold_sweeper())
+    yield
+    hold_sweeper.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# added last runs first: CORS, then compression, then ETag/304 closest to the routes
+app.add_middleware(ETagMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.include_router(health_router)
@@ -43,9 +65,11 @@ app.include_router(show_router)
 app.include_router(seat_router)
 app.include_router(booking_router)
 app.include_router(promotions_router)
+app.include_router(promotions_public_router)
 app.include_router(price_router)
 app.include_router(orders_router)
 app.include_router(orders_router)
+app.include_router(now_showing_router)
 
 
 
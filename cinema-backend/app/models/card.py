@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, Date, ForeignKey, String
 from sqlalchemy.orm import relationship
 from app.core.db import Base
-from app.core.security import encrypt_data, decrypt_data
+from app.core.security import card_brand, card_last_four, encrypt_data, decrypt_data
 
 class Card(Base):
     __tablename__ = "cards"
@@ -12,12 +12,17 @@ class Card(Base):
     exp_date = Column(Date, nullable=False)
     customer_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     cvc = Column(String(255), nullable=False)
+    # plain-text display fields so card pickers need no decryption
+    last_four = Column(String(4), nullable=True)
+    brand = Column(String(20), nullable=True)
 
     user = relationship("User", back_populates="cards")
     address = relationship("Address", back_populates="cards")
 
     # Encrypt sensitive fields before saving
     def encrypt_sensitive_fields(self):
+        self.last_four = card_last_four(self.number)
+        self.brand = card_brand(self.number)
         self.number = encrypt_data(self.number)
         self.cvc = encrypt_data(self.cvc)
 
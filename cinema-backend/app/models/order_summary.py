@@ -0,0 +1,26 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, Float, DateTime, ForeignKey, Index, Integer, String
+from app.core.db import Base
+
+class OrderSummary(Base):
+    """
+    Denormalized copy of a booking as shown in order history, written by
+    checkout in the same transaction as the booking. Names and seat labels
+    are a snapshot taken at booking time.
+    """
+    __tablename__ = "order_summaries"
+    __table_args__ = (Index("ix_order_summaries_user_booking", "user_id", "booking_id"),)
+
+    booking_id: Mapped[int] = mapped_column(
+        ForeignKey("booking.booking_id", ondelete="CASCADE", onupdate="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="CASCADE", onupdate="CASCADE"))
+    show_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_amount: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    movie_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    showroom_name: Mapped[str | None] = mapped_column(String(45), nullable=True)
+    show_time: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    seat_labels: Mapped[list] = mapped_column(JSON, nullable=False)
+    # ReservedSeatRead dumps, so history needs no join to reserved_seats
+    reserved_seats: Mapped[list] = mapped_column(JSON, nullable=False)
@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, String
+from app.core.db import Base
+
+class RefreshToken(Base):
+    """
+    A refresh token that has been issued and not used yet. ``/auth/refresh``
+    deletes the row it redeems, so every refresh token works once.
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.user_id", ondelete="CASCADE", onupdate="CASCADE"), index=True
+    )
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
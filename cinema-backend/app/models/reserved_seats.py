@@ -13,5 +13,7 @@ class ReservedSeat(Base):
     seat_id: Mapped[int] = mapped_column(ForeignKey("seats.seats_id", ondelete="CASCADE", onupdate="CASCADE"))
     user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="CASCADE", onupdate="CASCADE"))
     booked_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # set while the row is a temporary hold; cleared once it belongs to a booking
+    expires_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True, index=True)
 
     booking = relationship("Booking", back_populates="reserved_seats")
@@ -25,6 +25,8 @@ class User(Base):
     state = Column(Enum(StateType, name="user_state"), nullable=True, server_default=text("'Active'"))
     promo = Column(Boolean, nullable=True, server_default=text('0'))
     address_id = Column(Integer, ForeignKey("address.address_id"))
+    # bumped to invalidate every token issued so far; tokens carry it as "ver"
+    token_version = Column(Integer, nullable=False, default=0, server_default=text('0'))
 
     
     address = relationship("Address", back_populates="users")
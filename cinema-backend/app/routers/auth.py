@@ -1,15 +1,32 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.db import get_session
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.dependencies import pooled_hash
+from app.core.principals import invalidate_principal
+from app.core.rate_limit import account_key, auth_ip, client_ip, enforce, limit_ip, login_account, password_reset_account
+from app.core.security import (
+    create_access_token,
+    decode_refresh_token,
+    get_password_hash_async,
+    verify_password_async,
+)
+from app.core.tokens import (
+    bump_token_version,
+    is_revoked,
+    issue_refresh_token,
+    redeem_refresh_token,
+    revoke_tokens,
+)
 from app.core.verification import VerificationParams, validate_verification_params
 from app.models.user import StateType, User
 from app.schemas.user import (
     PasswordResetConfirm,
     PasswordResetRequest,
+    RefreshRequest,
     SignupResponse,
     Token,
     UserCreate,
@@ -24,7 +41,7 @@ from app.services.email_notifications import (
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/signup", response_model=SignupResponse, status_code=201)
+@router.post("/signup", response_model=SignupResponse, status_code=201, dependencies=[Depends(limit_ip(auth_ip))])
 async def signup(
     payload: UserCreate,
     background_tasks: BackgroundTasks,
@@ -43,7 +60,7 @@ async def signup(
         first_name=payload.first_name,
         last_name=payload.last_name,
         email=payload.email,
-        password=get_password_hash(payload.password),
+        password=await pooled_hash(get_password_hash_async(payload.password)),
         role=UserType.customer,
         state=StateType.Inactive,
         promo=bool(payload.promo),
@@ -108,11 +125,14 @@ async def signup(
 
 
 @router.post("/login", response_model=Token)
-async def login(payload: UserLogin, session: AsyncSession = Depends(get_session)):
+async def login(payload: UserLogin, request: Request, session: AsyncSession = Depends(get_session)):
+    # throttle before the user lookup and bcrypt
+    enforce((auth_ip, client_ip(request)), (login_account, account_key(payload.email)))
+
     result = await session.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.password):
+    if not user or not await pooled_hash(verify_password_async(payload.password, user.password)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -124,10 +144,15 @@ async def login(payload: UserLogin, session: AsyncSession = Depends(get_session)
             detail="Account pending email verification",
         )
 
-    token = create_access_token(subject=user.user_id)
+    token = create_access_token(
+        subject=user.user_id, role=user.role, state=user.state, version=user.token_version
+    )
+    refresh = await issue_refresh_token(session, user)
+    await session.commit()
     return {
         "access_token": token,
         "token": token,
+        "refresh_token": refresh,
         "token_type": "bearer",
         "user": {
             "user_id": user.user_id,
@@ -139,6 +164,42 @@ async def login(payload: UserLogin, session: AsyncSession = Depends(get_session)
     }
 
 
+@router.post("/refresh", response_model=Token, dependencies=[Depends(limit_ip(auth_ip))])
+async def refresh_token(payload: RefreshRequest, session: AsyncSession = Depends(get_session)):
+    """
+    Trade a refresh token for a new access token carrying the user's current
+    role and state. The refresh token is used up and replaced by a new one.
+    """
+    try:
+        claims = decode_refresh_token(payload.refresh_token)
+        user_id = int(claims["sub"])
+    except (JWTError, KeyError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    if is_revoked(user_id, claims.get("iat")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+    user = await session.get(User, user_id)
+    if not user or user.state != StateType.Active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    if claims.get("ver", 0) != user.token_version or not await redeem_refresh_token(
+        session, user_id, claims.get("jti")
+    ):
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+    refresh = await issue_refresh_token(session, user)
+    await session.commit()
+    return {
+        "access_token": create_access_token(
+            subject=user.user_id, role=user.role, state=user.state, version=user.token_version
+        ),
+        "refresh_token": refresh,
+        "token_type": "bearer",
+    }
+
+
 @router.get("/verify")
 async def verify_email(
     uid: int,
@@ -175,6 +236,7 @@ async def verify_email(
     user.state = StateType.Active
     session.add(user)
     await session.commit()
+    invalidate_principal(user.user_id)
 
     return {"message": "Email verified successfully"}
 
@@ -182,9 +244,12 @@ async def verify_email(
 @router.post("/forgot-password", status_code=status.HTTP_202_ACCEPTED)
 async def forgot_password(
     payload: PasswordResetRequest,
+    request: Request,
     background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
+    enforce((auth_ip, client_ip(request)), (password_reset_account, account_key(payload.email)))
+
     result = await session.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
 
@@ -201,7 +266,7 @@ async def forgot_password(
     }
 
 
-@router.post("/reset-password")
+@router.post("/reset-password", dependencies=[Depends(limit_ip(auth_ip))])
 async def reset_password(
     payload: PasswordResetConfirm,
     session: AsyncSession = Depends(get_session),
@@ -233,8 +298,11 @@ async def reset_password(
             detail=str(exc),
         ) from exc
 
-    user.password = get_password_hash(payload.password)
+    user.password = await pooled_hash(get_password_hash_async(payload.password))
+    bump_token_version(user)
     session.add(user)
     await session.commit()
+    invalidate_principal(user.user_id)
+    revoke_tokens(user.user_id)
 
     return {"message": "Password updated successfully"}
@@ -1,32 +1,55 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import and_, delete, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, OperationalError
 
+from app.core.config import settings
 from app.core.db import get_session
-from app.core.dependencies import get_current_user
+from app.core.principals import Principal
+from app.core.dependencies import get_current_principal
 from app.models.reserved_seats import ReservedSeat
 from app.models.show import Show
 from app.models.seats import Seat
 from app.models.showroom import Showroom
 from app.models.movie import Movie
-from app.models.user import User
 from app.models.booking import Booking
+from app.models.order_summary import OrderSummary
 
 from app.schemas.booking import BookingRead, OrderConfirmationRequest
-from app.schemas.reserved_seats import ReservedSeatCreate, ReservedSeatRead
+from app.schemas.reserved_seats import (
+    ReservedSeatCreate,
+    ReservedSeatRead,
+    SeatHoldRead,
+    SeatHoldRequest,
+)
 from app.services.email_notifications import queue_order_confirmation_email
+from app.services.order_summaries import summary_values
+from app.services.pricing import PricingError, quote_order
+from app.services.seat_availability import SEAT_BOOKED, SEAT_FREE, SEAT_HELD, mark_seats
+from app.services.seat_holds import hold_expiry, is_expired_hold, utcnow
 
 
 router = APIRouter(prefix="/booking", tags=["Booking"])
 
+# MySQL lock wait timeout, deadlock, and NOWAIT lock failure
+_LOCK_CONFLICT_CODES = {1205, 1213, 3572}
+
+
+def _is_lock_conflict(exc: OperationalError) -> bool:
+    args = getattr(exc.orig, "args", None)
+    return bool(args) and args[0] in _LOCK_CONFLICT_CODES
+
 
 async def _create_booking_and_send_email(
     payload: OrderConfirmationRequest,
     background_tasks: BackgroundTasks,
     db: AsyncSession,
-    current_user: User,
-) -> Booking:
+    current_user: Principal,
+) -> BookingRead:
     if not payload.creditcard:
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST,
@@ -39,113 +62,331 @@ async def _create_booking_and_send_email(
             "Cannot create a booking for another user",
         )
 
+    # the server's price is authoritative; a client total is only a check
+    try:
+        quote = await quote_order(db, payload.ticket_types, payload.promo_code)
+    except PricingError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+    if payload.total_amount is not None and abs(Decimal(str(payload.total_amount)) - quote.total) > Decimal("0.005"):
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            f"Order total changed, the current total is {quote.total}",
+        )
+    total_amount = float(quote.total)
+
     user = current_user
+    conflict = HTTPException(
+        status.HTTP_409_CONFLICT,
+        "One or more seats were just booked by someone else. Please re-select seats.",
+    )
+    # "claim" locks and claims the seats before the booking row is written, so
+    # concurrent losers abort early instead of rolling back a finished checkout
+    claim_first = settings.CHECKOUT_LOCK_MODE == "claim"
 
-    show = await db.get(Show, payload.show_id)
-    if not show:
+    # One round-trip for the show, its movie and showroom, the requested seats
+    # and any existing reservation of those seats for this show.
+    query = (
+        select(
+            Show.showroom_id,
+            Show.date_time,
+            Movie.name.label("movie_name"),
+            Showroom.name.label("showroom_name"),
+            Seat.seats_id,
+            Seat.showroom_id.label("seat_showroom_id"),
+            Seat.row_no,
+            Seat.seat_no,
+            ReservedSeat.reserved_id,
+            ReservedSeat.user_id,
+            ReservedSeat.booking_id,
+            ReservedSeat.expires_at,
+            ReservedSeat.booked_at,
+        )
+        .outerjoin(Movie, Movie.movie_id == Show.movieid)
+        .outerjoin(Showroom, Showroom.showroom_id == Show.showroom_id)
+        .outerjoin(Seat, Seat.seats_id.in_(payload.seat_ids))
+        .outerjoin(
+            ReservedSeat,
+            and_(
+                ReservedSeat.show_id == Show.show_id,
+                ReservedSeat.seat_id == Seat.seats_id,
+            ),
+        )
+        .where(Show.show_id == payload.show_id)
+    )
+    if claim_first:
+        query = query.with_for_update(nowait=True, of=ReservedSeat)
+    try:
+        rows = (await db.execute(query)).all()
+    except OperationalError as exc:
+        await db.rollback()
+        if _is_lock_conflict(exc):
+            raise conflict
+        raise
+    if not rows:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Showtime not found")
 
-    seats_result = await db.execute(
-        select(Seat).where(Seat.seats_id.in_(payload.seat_ids))
-    )
-    seats = seats_result.scalars().all()
+    show = rows[0]
+    seats = [row for row in rows if row.seats_id is not None]
 
     found_ids = {seat.seats_id for seat in seats}
     missing = [seat_id for seat_id in payload.seat_ids if seat_id not in found_ids]
     if missing:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Seat(s) not found: {missing}")
 
-    invalid = [seat.seats_id for seat in seats if seat.showroom_id != show.showroom_id]
+    invalid = [seat.seats_id for seat in seats if seat.seat_showroom_id != show.showroom_id]
     if invalid:
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST,
             "One or more seats do not belong to the selected show",
         )
 
-    existing_result = await db.execute(
-        select(ReservedSeat).where(
-            ReservedSeat.show_id == payload.show_id,
-            ReservedSeat.seat_id.in_(payload.seat_ids),
-        )
-    )
-    existing = existing_result.scalars().all()
+    existing = [row for row in seats if row.reserved_id is not None]
 
-    stolen = [
-        f"{seat.row_no}{seat.seat_no}"
-        for seat in seats
+    # the user's own holds and any expired hold can be converted; anything else is taken
+    now = utcnow()
+    taken_ids = {
+        rs.seats_id
         for rs in existing
-        if rs.seat_id == seat.seats_id and rs.user_id != current_user.user_id
-    ]
+        if rs.booking_id is not None
+        or (rs.user_id != current_user.user_id and not is_expired_hold(rs, now))
+    }
+    stolen = [f"{seat.row_no}{seat.seat_no}" for seat in seats if seat.seats_id in taken_ids]
     if stolen:
         raise HTTPException(
             status.HTTP_409_CONFLICT,
             f"Seat(s) already reserved by another user: {sorted(set(stolen))}",
         )
 
+    seat_labels = sorted(f"{seat.row_no}{seat.seat_no}" for seat in seats)
+
+    # Set here rather than by the server default: MySQL has no RETURNING, so a
+    # server-side timestamp would cost a readback. It is also UTC, like
+    # expires_at, whatever the database session's time zone.
+    now_utc = datetime.now(timezone.utc)
     booking = Booking(
         user_id=current_user.user_id,
         show_id=payload.show_id,
-        total_amount=payload.total_amount,
+        total_amount=total_amount,
         creditcard=payload.creditcard,
+        created_at=now_utc,
     )
-    db.add(booking)
-    await db.flush()
-
-    existing_by_seat = {rs.seat_id: rs for rs in existing}
-    for seat in seats:
-        if seat.seats_id in existing_by_seat:
-            existing_by_seat[seat.seats_id].booking_id = booking.booking_id
-        else:
-            db.add(
-                ReservedSeat(
-                    booking_id=booking.booking_id,
-                    user_id=current_user.user_id,
-                    show_id=payload.show_id,
-                    seat_id=seat.seats_id,
-                )
-            )
+
+    new_seat_ids = [seat.seats_id for seat in seats if seat.reserved_id is None]
+    new_rows = [
+        {"user_id": current_user.user_id, "show_id": payload.show_id, "seat_id": seat_id, "booked_at": now_utc}
+        for seat_id in new_seat_ids
+    ]
+    # rows that exist without a booking and must be attached to the new one
+    attach_ids = [seat.seats_id for seat in seats if claim_first or seat.reserved_id is not None]
 
     try:
+        if claim_first and new_rows:
+            await db.execute(insert(ReservedSeat).values(new_rows))
+        db.add(booking)
+        await db.flush()
+        if not claim_first and new_rows:
+            await db.execute(
+                insert(ReservedSeat).values(
+                    [{**row, "booking_id": booking.booking_id} for row in new_rows]
+                )
+            )
+        if attach_ids:
+            attached = await db.execute(
+                update(ReservedSeat)
+                .where(
+                    ReservedSeat.show_id == payload.show_id,
+                    ReservedSeat.seat_id.in_(attach_ids),
+                    ReservedSeat.booking_id.is_(None),
+                )
+                .values(booking_id=booking.booking_id, user_id=current_user.user_id, expires_at=None)
+            )
+            if attached.rowcount != len(attach_ids):
+                # the sweeper released one of the holds mid-checkout
+                await db.rollback()
+                raise conflict
+        # held rows came with the first query; only the new rows' ids are read back
+        new_ids = {}
+        if new_seat_ids:
+            new_ids = dict(
+                (
+                    await db.execute(
+                        select(ReservedSeat.seat_id, ReservedSeat.reserved_id).where(
+                            ReservedSeat.show_id == payload.show_id,
+                            ReservedSeat.seat_id.in_(new_seat_ids),
+                        )
+                    )
+                ).all()
+            )
+        reserved = [
+            ReservedSeatRead(
+                reserved_id=new_ids.get(seat.seats_id, seat.reserved_id),
+                show_id=payload.show_id,
+                seat_id=seat.seats_id,
+                user_id=current_user.user_id,
+                booked_at=seat.booked_at or now_utc,
+                expires_at=None,
+            )
+            for seat in seats
+        ]
+        # history reads this row instead of joining five tables per page
+        await db.execute(
+            insert(OrderSummary).values(
+                summary_values(
+                    booking,
+                    reserved,
+                    movie_name=show.movie_name,
+                    showroom_name=show.showroom_name,
+                    show_time=show.date_time,
+                    seat_labels=seat_labels,
+                )
+            )
+        )
         await db.commit()
     except IntegrityError:
         await db.rollback()
-        raise HTTPException(
-            status.HTTP_409_CONFLICT,
-            "One or more seats were just booked by someone else. Please re-select seats.",
-        )
-
-    await db.refresh(booking)
-    await db.refresh(booking, ["reserved_seats"])
+        raise conflict
+    except OperationalError as exc:
+        await db.rollback()
+        if _is_lock_conflict(exc):
+            raise conflict
+        raise
 
-    movie = await db.get(Movie, show.movieid)
-    showroom = await db.get(Showroom, show.showroom_id)
-    seat_labels = sorted(f"{seat.row_no}{seat.seat_no}" for seat in seats)
+    mark_seats(payload.show_id, found_ids, SEAT_BOOKED)
 
     queue_order_confirmation_email(
         background_tasks,
         email=user.email,
         first_name=user.first_name,
-        movie_title=movie.name if movie else "Your movie",
+        movie_title=show.movie_name or "Your movie",
         show_time=show.date_time,
-        showroom_name=showroom.name if showroom else None,
+        showroom_name=show.showroom_name,
         seats=seat_labels,
-        total_amount=payload.total_amount,
+        total_amount=total_amount,
     )
 
-    return booking
+    return BookingRead(
+        booking_id=booking.booking_id,
+        user_id=booking.user_id,
+        show_id=booking.show_id,
+        total_amount=booking.total_amount,
+        created_at=booking.created_at,
+        reserved_seats=reserved,
+        movie_name=show.movie_name,
+        showroom=show.showroom_name,
+        seat_labels=seat_labels,
+    )
 
 
 @router.post("/reserve", response_model=ReservedSeatRead)
-async def reserve_seat(payload: ReservedSeatCreate, db: AsyncSession = Depends(get_session)):
-    new_reservation = ReservedSeat(**payload.model_dump())
+async def reserve_seat(
+    payload: ReservedSeatCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Place a temporary hold on a seat for the caller; it expires unless renewed or checked out."""
+    new_reservation = ReservedSeat(
+        show_id=payload.show_id,
+        seat_id=payload.seat_id,
+        user_id=current_user.user_id,
+        expires_at=hold_expiry(),
+    )
     db.add(new_reservation)
     try:
         await db.commit()
-        await db.refresh(new_reservation)
-        return new_reservation
     except IntegrityError:
         await db.rollback()
-        raise HTTPException(400, "Seat already reserved for this show")
+        # take over an expired hold the sweeper has not released yet
+        takeover = await db.execute(
+            update(ReservedSeat)
+            .where(
+                ReservedSeat.show_id == payload.show_id,
+                ReservedSeat.seat_id == payload.seat_id,
+                ReservedSeat.booking_id.is_(None),
+                ReservedSeat.expires_at <= utcnow(),
+            )
+            .values(user_id=current_user.user_id, expires_at=hold_expiry(), booked_at=func.now())
+        )
+        if not takeover.rowcount:
+            raise HTTPException(400, "Seat already reserved for this show")
+        await db.commit()
+        new_reservation = (
+            await db.execute(
+                select(ReservedSeat).where(
+                    ReservedSeat.show_id == payload.show_id,
+                    ReservedSeat.seat_id == payload.seat_id,
+                )
+            )
+        ).scalar_one()
+    else:
+        await db.refresh(new_reservation)
+
+    mark_seats(payload.show_id, [payload.seat_id], SEAT_HELD)
+    return new_reservation
+
+
+@router.post("/reserve/renew", response_model=SeatHoldRead)
+async def renew_seat_holds(
+    payload: SeatHoldRequest,
+    db: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Extend the caller's unexpired holds, e.g. while they are still in checkout."""
+    expires_at = hold_expiry()
+    result = await db.execute(
+        update(ReservedSeat)
+        .where(
+            ReservedSeat.show_id == payload.show_id,
+            ReservedSeat.user_id == current_user.user_id,
+            ReservedSeat.seat_id.in_(payload.seat_ids),
+            ReservedSeat.booking_id.is_(None),
+            ReservedSeat.expires_at > utcnow(),
+        )
+        .values(expires_at=expires_at)
+    )
+
+    if result.rowcount != len(set(payload.seat_ids)):
+        # renew all of the holds or none of them
+        await db.rollback()
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            "One or more seat holds have expired. Please re-select seats.",
+        )
+    await db.commit()
+
+    return SeatHoldRead(show_id=payload.show_id, seat_ids=payload.seat_ids, expires_at=expires_at)
+
+
+@router.post("/reserve/release", response_model=SeatHoldRead)
+async def release_seat_holds(
+    payload: SeatHoldRequest,
+    db: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Drop the caller's holds when they leave checkout without booking."""
+    released = (
+        await db.execute(
+            select(ReservedSeat.seat_id).where(
+                ReservedSeat.show_id == payload.show_id,
+                ReservedSeat.user_id == current_user.user_id,
+                ReservedSeat.seat_id.in_(payload.seat_ids),
+                ReservedSeat.booking_id.is_(None),
+            )
+        )
+    ).scalars().all()
+
+    if released:
+        await db.execute(
+            delete(ReservedSeat).where(
+                ReservedSeat.show_id == payload.show_id,
+                ReservedSeat.user_id == current_user.user_id,
+                ReservedSeat.seat_id.in_(released),
+                ReservedSeat.booking_id.is_(None),
+            )
+        )
+        await db.commit()
+        mark_seats(payload.show_id, released, SEAT_FREE)
+
+    return SeatHoldRead(show_id=payload.show_id, seat_ids=released)
 
 
 @router.post("/checkout", response_model=BookingRead, status_code=status.HTTP_201_CREATED)
@@ -153,15 +394,14 @@ async def checkout_booking(
     payload: OrderConfirmationRequest,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    booking = await _create_booking_and_send_email(
+    return await _create_booking_and_send_email(
         payload,
         background_tasks,
         db,
         current_user,
     )
-    return BookingRead.model_validate(booking, from_attributes=True)
 
 
 @router.post("/confirm-email", status_code=status.HTTP_202_ACCEPTED)
@@ -169,7 +409,7 @@ async def send_order_confirmation(
     payload: OrderConfirmationRequest,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     booking = await _create_booking_and_send_email(
         payload,
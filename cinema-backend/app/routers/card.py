@@ -2,12 +2,15 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from app.core.db import get_session
+from app.core.dependencies import get_current_principal
+from app.core.principals import Principal
 from app.models.card import Card
-from app.schemas.card import CardCreate, CardRead
+from app.schemas.card import CardCreate, CardMasked, CardRead
 from app.models.address import Address
-from app.core.security import encrypt_data, decrypt_data
+from app.core.security import card_brand, card_last_four, encrypt_data, decrypt_data
 from datetime import datetime, date
 from app.models.user import User
+from app.services.cards import decrypt_cards, masked_card
 from app.services.email_notifications import queue_payment_method_email
 
 
@@ -79,7 +82,9 @@ async def create_card(
         address_id=address_id,
         exp_date=exp_date,
         customer_id=payload.customer_id,
-        cvc=encrypted_cvc
+        cvc=encrypted_cvc,
+        last_four=card_last_four(payload.number),
+        brand=card_brand(payload.number),
     )
 
     try:
@@ -106,12 +111,13 @@ async def create_card(
             action="added",
         )
 
-    # Decrypt before returning and avoid lazy relationship access during serialization
+    # Echo the submitted values instead of decrypting what was just encrypted,
+    # and avoid lazy relationship access during serialization
     return CardRead.model_validate(
         {
             "card_id": card_db.card_id,
-            "number": decrypt_data(card_db.number),
-            "cvc": decrypt_data(card_db.cvc),
+            "number": payload.number,
+            "cvc": str(payload.cvc),
             "address_id": card_db.address_id,
             "customer_id": card_db.customer_id,
             "exp_date": card_db.exp_date,
@@ -133,12 +139,13 @@ async def delete_card(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
 
     user = await session.get(User, card.customer_id)
-    digits = None
-    try:
-        decrypted_number = decrypt_data(card.number)
-        digits = "".join(ch for ch in decrypted_number if ch.isdigit())
-    except Exception:
-        pass
+    digits = card.last_four
+    if not digits:
+        try:
+            decrypted_number = decrypt_data(card.number)
+            digits = "".join(ch for ch in decrypted_number if ch.isdigit())
+        except Exception:
+            pass
 
     await session.delete(card)
     await session.commit()
@@ -152,39 +159,51 @@ async def delete_card(
             action="removed",
         )
 
-@router.get("/user/{user_id}", response_model=list[CardRead])
+@router.get("/user/{user_id}", response_model=list[CardMasked])
 async def list_user_cards(user_id: int, session: AsyncSession = Depends(get_session)):
-    """Fetch all cards for a given user (decrypt before returning)."""
+    """Fetch all cards for a given user, masked (nothing is decrypted)."""
     result = await session.execute(select(Card).where(Card.customer_id == user_id))
-    cards = result.scalars().all()
-
-    return [
-        CardRead.model_validate(
-            {
-                "card_id": card.card_id,
-                "number": decrypt_data(card.number),
-                "cvc": decrypt_data(card.cvc),
-                "address_id": card.address_id,
-                "customer_id": card.customer_id,
-                "exp_date": card.exp_date,
-                "address": None,
-            }
-        )
-        for card in cards
-    ]
+    return [masked_card(card) for card in result.scalars().all()]
+
+
+@router.get("/user/{user_id}/full", response_model=list[CardRead])
+async def list_user_cards_full(
+    user_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Fetch the caller's own cards with number and CVC decrypted."""
+    if user_id != current_user.user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot read another user's cards")
+
+    result = await session.execute(select(Card).where(Card.customer_id == user_id))
+    return await decrypt_cards(result.scalars().all())
 
 
-@router.get("/{card_id}", response_model=CardRead)
+@router.get("/{card_id}", response_model=CardMasked)
 async def get_card(card_id: int, session: AsyncSession = Depends(get_session)):
-    """Fetch a stored card by ID (decrypt before returning)."""
-    result = await session.execute(select(Card).where(Card.card_id == card_id))
-    card = result.scalar_one_or_none()
+    """Fetch a stored card by ID, masked (nothing is decrypted)."""
+    card = await session.get(Card, card_id)
+
+    if not card:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
+
+    return masked_card(card)
+
+
+@router.get("/{card_id}/full", response_model=CardRead)
+async def get_card_full(
+    card_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Fetch one of the caller's own cards with number and CVC decrypted."""
+    card = await session.get(Card, card_id)
 
     if not card:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
 
-    # Decrypt before returning to frontend
-    card.number = decrypt_data(card.number)
-    card.cvc = decrypt_data(card.cvc)
+    if card.customer_id != current_user.user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot read another user's cards")
 
-    return card
+    return (await decrypt_cards([card]))[0]
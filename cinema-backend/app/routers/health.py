@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text                           
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_session
+from app.core import principals, rate_limit
+from app.core.http_middleware import stats
 
 router = APIRouter(prefix="/healthcheck", tags=["health"])
 
@@ -19,4 +21,21 @@ async def db_health(db: AsyncSession = Depends(get_session)):
         return {"db": "ok", "result": r.scalar_one()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DB error: {e}")
-    
\ No newline at end of file
+    
+
+@router.get("/http")
+async def http_stats():
+    """Per-route response counts, 304s and bytes saved by compression in this process"""
+    return stats()
+
+
+@router.get("/principals")
+async def principal_cache_stats():
+    """Size and hit/miss counts of the authenticated-principal cache in this process"""
+    return principals.stats()
+
+
+@router.get("/rate-limits")
+async def rate_limit_stats():
+    """Allowed and rejected requests per rate-limit bucket in this process"""
+    return rate_limit.stats()
@@ -1,28 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
+from datetime import datetime
 from typing import List
 
 from app.core.db import get_session
+from app.core.http_cache import cached_json_response
+from app.core.pagination import Page, paginate
+from app.core.response_cache import invalidate
 from app.models.movie import Movie
-from app.schemas.movie import MovieRead, MovieCreate, MovieUpdate
+from app.models.show import Show
+from app.schemas.movie import MovieFacetResult, MovieRead, MovieCreate, MovieUpdate
+from app.services.movie_catalog import get_catalog_page, movie_deleted, movie_saved, peek_movie
+from app.services.movie_facets import filter_movies
+from app.services.movie_search import search_movies
+from app.services.seat_availability import invalidate_show
 
 router = APIRouter(prefix="/movies", tags=["movies"])
 
 @router.get("/", response_model=List[MovieRead])
-async def get_all_movies(db: AsyncSession = Depends(get_session)):
-    """Return all movies in the database"""
+async def get_all_movies(
+    request: Request,
+    page: Page = Depends(paginate),
+    db: AsyncSession = Depends(get_session),
+):
+    """Return a page of movies, ordered by movie_id"""
+    # served from the catalog cache as pre-serialized JSON; 304 if the ETag still matches
     try:
-        result = await db.execute(select(Movie))
-        movies = result.scalars().all()
-        return movies
+        body, etag, next_after = await get_catalog_page(db, page)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching all movies: {e}")
+    response = cached_json_response(request, body, etag)
+    if next_after is not None:
+        page.set_next(next_after, response)
+    return response
+
+
+@router.get("/search", response_model=List[MovieRead])
+async def search(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_session),
+):
+    """Ranked search over name, genre and description; every word may be partial."""
+    return await search_movies(db, q, limit)
+
+
+@router.get("/filter", response_model=MovieFacetResult)
+async def filter_catalog(
+    genre: List[str] = Query(default=[]),
+    rating: List[str] = Query(default=[]),
+    available: bool | None = None,
+    released_from: datetime | None = None,
+    released_to: datetime | None = None,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Matching movie ids plus counts per genre, rating, availability and release
+    year. Values of one facet are OR-ed, facets are AND-ed.
+    """
+    selected = {
+        "main_genre": genre,
+        "rating": rating,
+        "available": [] if available is None else ["true" if available else "false"],
+    }
+    return await filter_movies(db, selected, released_from, released_to)
 
 
 @router.get("/{movie_id}", response_model=MovieRead)
 async def get_movie(movie_id: int, db: AsyncSession = Depends(get_session)):
+    cached = peek_movie(movie_id)
+    if cached:
+        return cached
     movie = await db.get(Movie, movie_id)
     if not movie:
         raise HTTPException(404, "Movie not found")
@@ -34,6 +84,8 @@ async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_session)):
     movie = await db.get(Movie, movie_id)
     if not movie:
         raise HTTPException(404, "Movie not found")
+    # the movie's shows go with it (ON DELETE CASCADE)
+    show_ids = (await db.execute(select(Show.show_id).where(Show.movieid == movie_id))).scalars().all()
     await db.delete(movie)
     try:
         await db.commit()
@@ -43,6 +95,10 @@ async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_session)):
             status.HTTP_400_BAD_REQUEST,
             "Cannot delete a movie that has scheduled shows or existing bookings",
         )
+    movie_deleted(movie_id)
+    for show_id in show_ids:
+        invalidate_show(show_id)
+    invalidate("shows")
     return {"message": f"Movie {movie_id} deleted successfully"}
 
 @router.put("/{movie_id}", response_model=MovieRead)
@@ -61,7 +117,7 @@ async def update_movie(
     try:
         await db.commit()
         await db.refresh(movie)
-        return movie
+        return movie_saved(movie)
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating movie: {e}")
@@ -75,7 +131,7 @@ async def create_movie(movie: MovieCreate, db: AsyncSession = Depends(get_sessio
         db.add(new_movie)
         await db.commit()
         await db.refresh(new_movie)
-        return new_movie
+        return movie_saved(new_movie)
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding movie: {e}")
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.db import get_session
+from app.core.http_cache import cached_json_response
+from app.schemas.now_showing import NowShowingMovie
+from app.services.now_showing import get_now_showing_body
+
+router = APIRouter(prefix="/now-showing", tags=["Now Showing"])
+
+@router.get("/", response_model=List[NowShowingMovie])
+async def now_showing(request: Request, db: AsyncSession = Depends(get_session)):
+    """Available movies with their upcoming shows, showroom names and remaining seats."""
+    body, etag = await get_now_showing_body(db)
+    return cached_json_response(request, body, etag)
@@ -1,19 +1,53 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.core.db import get_session
+from app.core.dependencies import get_token_claims
+from app.core.response_cache import cached_json
+from app.core.tokens import TokenClaims
 from app.models.price import Price
-from app.schemas.price import PriceRead
+from app.schemas.price import PriceQuote, PriceQuoteLine, PriceQuoteRequest, PriceRead, PriceUpdate
+from app.services.pricing import PricingError, get_price_rows, invalidate_prices, quote_order
 
 price_router = APIRouter(prefix="/prices", tags=["prices"])
 
+_price_list = TypeAdapter(List[PriceRead])
+
 
 @price_router.get("/", response_model=list[PriceRead])
-async def get_all_prices(db: AsyncSession = Depends(get_session)):
-    result = await db.execute(select(Price))
-    return result.scalars().all()
+async def get_all_prices(request: Request, db: AsyncSession = Depends(get_session)):
+    async def load():
+        return list((await get_price_rows(db)).values())
+
+    return await cached_json(request, ["prices"], _price_list, load)
+
+
+@price_router.post("/quote", response_model=PriceQuote)
+async def quote_prices(payload: PriceQuoteRequest, db: AsyncSession = Depends(get_session)):
+    """Price a cart (one ticket type per seat) the same way checkout will."""
+    try:
+        quote = await quote_order(db, payload.ticket_types, payload.promo_code)
+    except PricingError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return PriceQuote(
+        lines=[
+            PriceQuoteLine(
+                ticket_type=line.ticket_type,
+                quantity=line.quantity,
+                unit_amount=line.unit_amount,
+                amount=line.amount,
+            )
+            for line in quote.lines
+        ],
+        subtotal=quote.subtotal,
+        discount_percent=quote.discount_percent,
+        discount=quote.discount,
+        total=quote.total,
+        promo_code=quote.promo_code,
+    )
 
 
 @price_router.get("/{ticket_type}", response_model=PriceRead)
@@ -23,14 +57,35 @@ async def get_price_by_type(
 ):
     ticket_type = ticket_type.lower()
 
-    result = await db.execute(
-        select(Price).where(Price.type == ticket_type)
-    )
-    price = result.scalars().first()
+    price = (await get_price_rows(db)).get(ticket_type)
+
+    if not price:
+        raise HTTPException(status_code=404, detail="Price type not found")
+
+    return price
+
+@price_router.put("/{ticket_type}", response_model=PriceRead)
+async def update_price(
+        ticket_type: str,
+        payload: PriceUpdate,
+        db: AsyncSession = Depends(get_session),
+        current_user: TokenClaims = Depends(get_token_claims),
+):
+    """Change a ticket type's price (admin only); quotes and checkout see it right away."""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    price = (
+        await db.execute(select(Price).where(func.lower(Price.type) == ticket_type.lower()))
+    ).scalars().first()
 
     if not price:
         raise HTTPException(status_code=404, detail="Price type not found")
 
+    price.amount = payload.amount
+    await db.commit()
+    await db.refresh(price)
+    invalidate_prices()
     return price
 
 router = price_router
\ No newline at end of file
@@ -1,22 +1,42 @@
 from typing import List
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_session
+from app.core.pagination import Page, paginate
 from app.models.user import User, StateType
 from app.models.promotion import Promotion
-from app.schemas.promotion import PromotionCreate, PromotionRead
+from app.schemas.promotion import PromotionCreate, PromotionRead, PromotionValidation
 from app.services.email_notifications import queue_promotion_email
+from app.services.promotions import active_promotions, find_active, promotion_deleted, promotion_saved
 
 router = APIRouter(prefix="/admin/promotions", tags=["promotions"])
+public_router = APIRouter(prefix="/promotions", tags=["promotions"])
+
+
+@public_router.get("/validate", response_model=PromotionValidation)
+async def validate_promotion(
+    code: str = Query(min_length=1, max_length=50),
+    db: AsyncSession = Depends(get_session),
+):
+    """Check a promo code as the user types it; served from the in-memory index."""
+    promo = await find_active(db, code)
+    if promo is None:
+        return PromotionValidation(code=code, valid=False)
+    return PromotionValidation(code=promo.code, valid=True, discount=promo.discount, end_date=promo.end_date)
+
+
+@public_router.get("/active", response_model=List[PromotionRead])
+async def list_active_promotions(db: AsyncSession = Depends(get_session)):
+    return await active_promotions(db)
 
 
 @router.get("/", response_model=List[PromotionRead])
-async def list_promotions(db: AsyncSession = Depends(get_session)):
-    result = await db.execute(select(Promotion))
-    return result.scalars().all()
+async def list_promotions(page: Page = Depends(paginate), db: AsyncSession = Depends(get_session)):
+    result = await db.execute(page.apply(select(Promotion), Promotion.promotions_id))
+    return page.finish(result.scalars().all(), key=lambda promo: promo.promotions_id)
 
 
 @router.post("/", response_model=PromotionRead, status_code=status.HTTP_201_CREATED)
@@ -38,6 +58,7 @@ async def create_promotion(
         raise HTTPException(status_code=500, detail=f"Error creating promotion: {exc}") from exc
 
     await db.refresh(promo)
+    promotion_saved(promo)
 
     subscribers = await db.execute(
         select(User).where(
@@ -103,3 +124,4 @@ async def delete_promotion(promotion_id: int, db: AsyncSession = Depends(get_ses
     except Exception as exc:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting promotion: {exc}") from exc
+    promotion_deleted(promotion_id)
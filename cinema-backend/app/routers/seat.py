@@ -1,25 +1,162 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from typing import List
-from app.core.db import get_session
-from app.models.seats import Seat
-from app.models.reserved_seats import ReservedSeat
-from app.schemas.seats import SeatRead
+from app.core.db import async_session, get_session
+from app.models.show import Show
+from app.schemas.seats import SeatRead, ShowSeatCount
+from app.services.seat_allocator import best_block
+from app.services.seat_availability import (
+    get_show_availability,
+    load_seat_counts,
+    peek_show_availability,
+)
+from app.services.seat_events import RESYNC, snapshot_message, subscribe, unsubscribe
 
 router = APIRouter(prefix="/seats", tags=["Seats"])
 
 @router.get("/show/{show_id}/available", response_model=List[SeatRead])
 async def get_available_seats(show_id: int, db: AsyncSession = Depends(get_session)):
-    # Find showroom for the show
-    from app.models.show import Show
-    show = await db.get(Show, show_id)
-    if not show:
+    # Served from the per-show availability bitmap; only a cache miss hits the DB
+    availability = await get_show_availability(db, show_id)
+    if not availability:
         return []
-    # Get all seats in that showroom
-    seats = (await db.execute(select(Seat).where(Seat.showroom_id == show.showroom_id))).scalars().all()
-    # Find reserved seats for this show
-    taken = (await db.execute(select(ReservedSeat.seat_id).where(ReservedSeat.show_id == show_id))).scalars().all()
-    # Filter out taken ones
-    available = [s for s in seats if s.seats_id not in taken]
-    return available
+    layout = availability.layout
+    return [
+        {
+            "seats_id": layout.seat_ids[i],
+            "showroom_id": layout.showroom_id,
+            "row_no": layout.row_nos[i],
+            "seat_no": layout.seat_nos[i],
+        }
+        for i in availability.available_ordinals()
+    ]
+
+
+@router.get("/show/{show_id}/best", response_model=List[SeatRead])
+async def get_best_available_seats(
+    show_id: int,
+    party_size: int = Query(ge=1, le=20),
+    db: AsyncSession = Depends(get_session),
+):
+    """Best contiguous block of free seats in one row for a party; empty if none fits."""
+    availability = await get_show_availability(db, show_id)
+    if not availability:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Showtime not found")
+    layout = availability.layout
+    ordinals = best_block(layout, availability.states, party_size) or []
+    return [
+        {
+            "seats_id": layout.seat_ids[i],
+            "showroom_id": layout.showroom_id,
+            "row_no": layout.row_nos[i],
+            "seat_no": layout.seat_nos[i],
+        }
+        for i in ordinals
+    ]
+
+
+@router.get("/availability", response_model=List[ShowSeatCount])
+async def get_seat_counts(
+    show_ids: List[int] = Query(default=[], max_length=200),
+    movie_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    cached: bool = False,
+    db: AsyncSession = Depends(get_session),
+):
+    """Remaining/total seat counts for many shows (by id, or by movie and date range) at once."""
+    if not show_ids and movie_id is None:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Provide show_ids or a movie_id")
+
+    counts: dict[int, ShowSeatCount] = {}
+
+    # cached path: shows whose bitmap is already in memory need no query
+    pending = list(dict.fromkeys(show_ids))
+    if cached and movie_id is None:
+        for show_id in show_ids:
+            entry = peek_show_availability(show_id)
+            if entry:
+                counts[show_id] = ShowSeatCount(
+                    show_id=show_id,
+                    total_seats=len(entry.states),
+                    reserved=entry.taken,
+                    remaining=entry.remaining,
+                )
+        pending = [show_id for show_id in pending if show_id not in counts]
+
+    criteria = []
+    if pending:
+        criteria.append(Show.show_id.in_(pending))
+    if movie_id is not None:
+        criteria.append(Show.movieid == movie_id)
+        if date_from:
+            criteria.append(Show.date_time >= date_from)
+        if date_to:
+            criteria.append(Show.date_time < date_to)
+
+    if criteria:
+        for show_id, (total, reserved) in (await load_seat_counts(db, *criteria)).items():
+            counts[show_id] = ShowSeatCount(
+                show_id=show_id,
+                total_seats=total,
+                reserved=reserved,
+                remaining=max(total - reserved, 0),
+            )
+
+    return [counts[show_id] for show_id in sorted(counts)]
+
+
+async def _seat_map_snapshot(show_id: int) -> str | None:
+    # short-lived session so idle viewers do not pin pooled connections
+    async with async_session() as db:
+        availability = await get_show_availability(db, show_id)
+    if not availability:
+        return None
+    return snapshot_message(show_id, availability.snapshot())
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/show/{show_id}/live")
+async def seat_map_live(websocket: WebSocket, show_id: int):
+    """Send a seat-map snapshot, then push held/booked/released deltas as they happen."""
+    await websocket.accept()
+    # subscribe first so no change between the snapshot and the first delta is lost
+    queue = subscribe(show_id)
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        snapshot = await _seat_map_snapshot(show_id)
+        if snapshot is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Showtime not found")
+            return
+        await websocket.send_text(snapshot)
+
+        while True:
+            next_message = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait(
+                {next_message, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                next_message.cancel()
+                return
+            message = next_message.result()
+            if message is RESYNC:
+                message = await _seat_map_snapshot(show_id)
+                if message is None:
+                    await websocket.close()
+                    return
+            await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        unsubscribe(show_id, queue)
@@ -1,44 +1,124 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections import defaultdict
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import List
 from app.core.db import get_session
+from app.core.pagination import Page, paginate
+from app.core.response_cache import cached_json, invalidate
 from app.models.show import Show
-from app.schemas.show import ShowCreate, ShowRead
+from app.schemas.show import ShowBulkCreate, ShowBulkItemResult, ShowBulkResult, ShowCreate, ShowRead
+from app.services.scheduling import find_conflicting_show, load_shows_in_window, show_end, sweep_conflicts
+from app.services.now_showing import mark_show_dirty
+from app.services.seat_availability import invalidate_show
 
 router = APIRouter(prefix="/shows", tags=["Shows"])
 
+_show_list = TypeAdapter(List[ShowRead])
+
 @router.get("/", response_model=List[ShowRead])
-async def get_all_shows(db: AsyncSession = Depends(get_session)):
-    res = await db.execute(select(Show))
-    return res.scalars().all()
+async def get_all_shows(request: Request, page: Page = Depends(paginate), db: AsyncSession = Depends(get_session)):
+    async def load():
+        res = await db.execute(page.apply(select(Show), Show.show_id))
+        return page.finish(res.scalars().all(), key=lambda show: show.show_id)
+
+    return await cached_json(request, ["shows"], _show_list, load, page.response)
 
 @router.get("/movie/{movie_id}", response_model=List[ShowRead])
-async def get_shows_for_movie(movie_id: int, db: AsyncSession = Depends(get_session)):
-    res = await db.execute(select(Show).where(Show.movieid == movie_id))
-    return res.scalars().all()
+async def get_shows_for_movie(request: Request, movie_id: int, db: AsyncSession = Depends(get_session)):
+    async def load():
+        res = await db.execute(select(Show).where(Show.movieid == movie_id))
+        return res.scalars().all()
+
+    return await cached_json(request, ["shows"], _show_list, load)
 
 @router.post("/", response_model=ShowRead, status_code=201)
 async def create_show(payload: ShowCreate, db: AsyncSession = Depends(get_session)):
-    existing = (await db.execute(select(Show).where(Show.showroom_id == payload.showroom_id))).scalars().all()
-
-    new_start = payload.date_time
-    new_start_ts = new_start.timestamp()
-    new_end_ts = new_start_ts + (payload.duration * 60)
-
-    for scheduled in existing:
-        scheduled_start_ts = scheduled.date_time.timestamp()
-        scheduled_end_ts = scheduled_start_ts + (scheduled.duration * 60)
-        if new_start_ts < scheduled_end_ts and new_end_ts > scheduled_start_ts:
-            raise HTTPException(400, "Scheduling conflict: overlaps another show in this showroom")
+    # only shows around the new slot are looked at, not the showroom's whole history
+    if await find_conflicting_show(db, payload.showroom_id, payload.date_time, payload.duration):
+        raise HTTPException(400, "Scheduling conflict: overlaps another show in this showroom")
 
     new_show = Show(**payload.model_dump())
     db.add(new_show)
     await db.commit()
     await db.refresh(new_show)
+    mark_show_dirty(new_show.show_id)
+    invalidate("shows")
     return new_show
 
 
+@router.post("/bulk", response_model=ShowBulkResult)
+async def create_shows_bulk(payload: ShowBulkCreate, db: AsyncSession = Depends(get_session)):
+    """
+    Schedule a batch of shows in one transaction. Each item is checked against
+    existing shows and the rest of the batch; conflicting items are reported
+    and skipped, the others are created.
+    """
+    results = [ShowBulkItemResult(index=i, created=False) for i in range(len(payload.shows))]
+
+    by_room: dict[int, list[tuple[int, datetime, int]]] = defaultdict(list)
+    for i, item in enumerate(payload.shows):
+        if item.duration <= 0:
+            results[i].detail = "Duration must be positive"
+            continue
+        by_room[item.showroom_id].append((i, item.date_time, item.duration))
+
+    accepted: list[int] = []
+    for showroom_id, candidates in by_room.items():
+        # one window query per showroom covering the whole batch
+        window_start = min(start for _, start, _ in candidates)
+        window_end = max(show_end(start, duration) for _, start, duration in candidates)
+        existing = await load_shows_in_window(db, showroom_id, window_start, window_end)
+        conflicts = sweep_conflicts(existing, candidates)
+        for i, _, _ in candidates:
+            if i not in conflicts:
+                accepted.append(i)
+                continue
+            kind, other = conflicts[i]
+            if kind == "show":
+                results[i].conflicting_show_id = other
+                results[i].detail = "Scheduling conflict: overlaps another show in this showroom"
+            else:
+                results[i].conflicting_index = other
+                results[i].detail = "Scheduling conflict: overlaps another show in this batch"
+
+    if accepted:
+        rows = [payload.shows[i].model_dump() for i in sorted(accepted)]
+        try:
+            await db.execute(insert(Show).values(rows))
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(409, "Schedule changed during import or an item references a missing movie/showroom; nothing was created")
+        # (showroom_id, date_time) is unique, so it identifies the new rows;
+        # DATETIME drops any offset, hence the naive keys
+        created = await db.execute(
+            select(Show).where(
+                tuple_(Show.showroom_id, Show.date_time).in_(
+                    [(row["showroom_id"], row["date_time"]) for row in rows]
+                )
+            )
+        )
+        shows = {(show.showroom_id, show.date_time.replace(tzinfo=None)): show for show in created.scalars()}
+        await db.commit()
+        invalidate("shows")
+        for i in accepted:
+            item = payload.shows[i]
+            results[i].created = True
+            results[i].show = ShowRead.model_validate(shows[(item.showroom_id, item.date_time.replace(tzinfo=None))])
+            mark_show_dirty(results[i].show.show_id)
+
+    return ShowBulkResult(
+        created=len(accepted),
+        rejected=len(results) - len(accepted),
+        items=results,
+    )
+
+
 @router.delete("/{show_id}", status_code=204)
 async def delete_show(show_id: int, db: AsyncSession = Depends(get_session)):
     show = await db.get(Show, show_id)
@@ -48,6 +128,8 @@ async def delete_show(show_id: int, db: AsyncSession = Depends(get_session)):
     try:
         await db.delete(show)
         await db.commit()
+        invalidate_show(show_id)
+        invalidate("shows")
     except Exception as exc:
         await db.rollback()
         if "1451" in str(exc):
@@ -1,17 +1,53 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import List
 from app.core.db import get_session
+from app.core.response_cache import cached_json, invalidate
+from app.models.seats import Seat
 from app.models.showroom import Showroom
-from app.schemas.showroom import ShowroomCreate, ShowroomRead
+from app.schemas.showroom import (
+    ShowroomCreate,
+    ShowroomLayoutCreate,
+    ShowroomLayoutRead,
+    ShowroomRead,
+    ShowroomRowRead,
+)
+from app.services.seat_availability import cache_showroom_layout, get_showroom_layout
+from app.services.seat_layout import ShowroomLayout, row_seat_numbers
 
 router = APIRouter(prefix="/showrooms", tags=["Showrooms"])
 
+_showroom_list = TypeAdapter(List[ShowroomRead])
+
+
+def _layout_read(room: Showroom, layout: ShowroomLayout) -> ShowroomLayoutRead:
+    return ShowroomLayoutRead(
+        showroom_id=room.showroom_id,
+        name=room.name,
+        total_seats=room.total_seats,
+        rows=[
+            ShowroomRowRead(
+                row_no=row_no,
+                seats=count,
+                first_ordinal=first,
+                seat_nos=list(layout.seat_nos[first:first + count]),
+            )
+            for row_no, first, count in layout.rows
+        ],
+    )
+
+
 @router.get("/", response_model=List[ShowroomRead])
-async def list_showrooms(db: AsyncSession = Depends(get_session)):
-    res = await db.execute(select(Showroom))
-    return res.scalars().all()
+async def list_showrooms(request: Request, db: AsyncSession = Depends(get_session)):
+    async def load():
+        res = await db.execute(select(Showroom))
+        return res.scalars().all()
+
+    return await cached_json(request, ["showrooms"], _showroom_list, load)
 
 @router.post("/", response_model=ShowroomRead, status_code=201)
 async def create_showroom(payload: ShowroomCreate, db: AsyncSession = Depends(get_session)):
@@ -19,4 +55,41 @@ async def create_showroom(payload: ShowroomCreate, db: AsyncSession = Depends(ge
     db.add(room)
     await db.commit()
     await db.refresh(room)
+    invalidate("showrooms")
     return room
+
+
+@router.post("/layout", response_model=ShowroomLayoutRead, status_code=201)
+async def create_showroom_with_layout(payload: ShowroomLayoutCreate, db: AsyncSession = Depends(get_session)):
+    """Create a showroom and all of its seats from a row-by-row layout."""
+    seats = [
+        {"row_no": row.row_no, "seat_no": seat_no}
+        for row in payload.rows
+        for seat_no in row_seat_numbers(row.seats, row.gaps)
+    ]
+    room = Showroom(name=payload.name, total_seats=len(seats))
+    db.add(room)
+    try:
+        await db.flush()
+        await db.execute(insert(Seat).values([{**seat, "showroom_id": room.showroom_id} for seat in seats]))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "A showroom with this name already exists")
+
+    # read the generated seat ids back once so the layout can be cached right away
+    rows = await db.execute(
+        select(Seat.seats_id, Seat.row_no, Seat.seat_no).where(Seat.showroom_id == room.showroom_id)
+    )
+    layout = ShowroomLayout.from_seats(room.showroom_id, rows.all())
+    await db.commit()
+    cache_showroom_layout(layout)
+    invalidate("showrooms")
+    return _layout_read(room, layout)
+
+
+@router.get("/{showroom_id}/layout", response_model=ShowroomLayoutRead)
+async def get_layout(showroom_id: int, db: AsyncSession = Depends(get_session)):
+    room = await db.get(Showroom, showroom_id)
+    if not room:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Showroom not found")
+    return _layout_read(room, await get_showroom_layout(db, showroom_id))
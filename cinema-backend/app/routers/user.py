@@ -6,12 +6,15 @@ from sqlalchemy.orm import selectinload
 
 
 from app.core.db import get_session
-from app.core.dependencies import get_current_user
-from app.core.security import get_password_hash, verify_password
+from app.core.dependencies import get_current_user, get_token_claims, pooled_hash
+from app.core.principals import invalidate_principal
+from app.core.pagination import Page, paginate
+from app.core.security import create_access_token, get_password_hash_async, verify_password_async
+from app.core.tokens import TokenClaims, bump_token_version, issue_refresh_token, revoke_tokens
 from app.models.address import Address
 from app.models.user import User
 from app.services.email_notifications import queue_profile_update_email
-from app.schemas.user import UserRead, UserUpdate, UserStateUpdate, UserType, StateType
+from app.schemas.user import UserRead, UserUpdate, UserUpdateRead, UserStateUpdate, UserType, StateType
 
 
 router = APIRouter(prefix="/user", tags=["user"])
@@ -28,21 +31,21 @@ async def get_user_profile(
 
 @router.get("/all", response_model=list[UserRead])
 async def get_all_users(
+    page: Page = Depends(paginate),
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    result = await db.execute(select(User).options(selectinload(User.address)))
-    users = result.scalars().all()
-    return users
+    result = await db.execute(page.apply(select(User).options(selectinload(User.address)), User.user_id))
+    return page.finish(result.scalars().all(), key=lambda user: user.user_id)
 
 @router.get("/{user_id}", response_model=UserRead)
 async def get_user_by_id(
     user_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -63,7 +66,7 @@ async def get_user_by_id(
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
 ):
     """Delete a user account (admin only)."""
     if current_user.role != "admin":
@@ -79,6 +82,8 @@ async def delete_user(
 
     await db.delete(user)
     await db.commit()
+    invalidate_principal(user_id)
+    revoke_tokens(user_id)
 
 
 @router.patch("/{user_id}/state", response_model=UserRead)
@@ -86,7 +91,7 @@ async def update_user_state(
     user_id: int,
     payload: UserStateUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
 ):
     """Admin-only: update another user's state."""
     if current_user.role != UserType.admin:
@@ -101,20 +106,28 @@ async def update_user_state(
 
     # assign enum value if your SQLAlchemy column is a string
     user.state = payload.state
+    bump_token_version(user)
 
     await db.commit()
+    invalidate_principal(user_id)
+    # the user's tokens still claim the old state
+    revoke_tokens(user_id)
     await db.refresh(user)
     return user
 
 
-@router.patch("/", response_model=UserRead)
+@router.patch("/", response_model=UserUpdateRead)
 async def update_user_info(
     payload: UserUpdate,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Update user profile and related address info."""
+    """
+    Update user profile and related address info. A password change revokes
+    every earlier token of the user, including the caller's, so the response
+    then carries a fresh token pair.
+    """
 
     user = current_user
     if not user:
@@ -148,9 +161,12 @@ async def update_user_info(
 
     # Handle password change
     if payload.new_password:
-        if not payload.current_password or not verify_password(payload.current_password, user.password):
+        if not payload.current_password or not await pooled_hash(
+            verify_password_async(payload.current_password, user.password)
+        ):
             raise HTTPException(status_code=403, detail="Current password is incorrect")
-        user.password = get_password_hash(payload.new_password)
+        user.password = await pooled_hash(get_password_hash_async(payload.new_password))
+        bump_token_version(user)
         changed_fields.append("password")
 
     # Handle address update
@@ -193,8 +209,19 @@ async def update_user_info(
         if target_tuple != original_address_tuple or address_id != original_address_id:
             changed_fields.append("address")
 
+    tokens = {}
+    if "password" in changed_fields:
+        # revoke first: only tokens issued after this point are accepted
+        revoke_tokens(user.user_id)
+        tokens["refresh_token"] = await issue_refresh_token(db, user)
     await db.commit()
+    invalidate_principal(user.user_id)
     await db.refresh(user, ["address"])
+    if tokens:
+        tokens["access_token"] = create_access_token(
+            subject=user.user_id, role=user.role, state=user.state, version=user.token_version
+        )
+        tokens["token_type"] = "bearer"
 
     if changed_fields:
         queue_profile_update_email(
@@ -204,4 +231,4 @@ async def update_user_info(
             fields_changed=changed_fields,
         )
 
-    return user
+    return UserUpdateRead.model_validate(user).model_copy(update=tokens)
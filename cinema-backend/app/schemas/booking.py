@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict, Field
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 from app.schemas.reserved_seats import ReservedSeatRead
 
@@ -8,9 +8,19 @@ class OrderConfirmationRequest(BaseModel):
     user_id: int
     show_id: int
     seat_ids: List[int] = Field(min_length=1)
-    total_amount: float = Field(ge=0)
+    # one ticket type per entry of seat_ids; the server prices the order and
+    # total_amount, if sent, is only checked against that price
+    ticket_types: List[str] = Field(min_length=1)
+    promo_code: Optional[str] = None
+    total_amount: Optional[float] = Field(default=None, ge=0)
     creditcard: int = Field(..., gt=0)
 
+    @model_validator(mode="after")
+    def check_ticket_types(self):
+        if len(self.ticket_types) != len(self.seat_ids):
+            raise ValueError("ticket_types must have one entry per seat")
+        return self
+
 
 class BookingRead(BaseModel):
     booking_id: int
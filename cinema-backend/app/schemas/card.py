@@ -20,3 +20,13 @@ class CardCreate(CardBase):
 class CardRead(CardBase):
     card_id: int   
     model_config = ConfigDict(from_attributes=True)
+
+# for card pickers: display fields only, nothing decrypted
+class CardMasked(BaseModel):
+    card_id: int
+    number: str
+    last_four: Optional[str] = None
+    brand: Optional[str] = None
+    address_id: Optional[int] = None
+    customer_id: Optional[int] = None
+    exp_date: date
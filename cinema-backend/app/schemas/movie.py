@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 #shared fields
 class MovieBase(BaseModel):
@@ -45,4 +45,14 @@ class MovieUpdate(BaseModel):
     available: Optional[bool] = None
     poster: Optional[str] = None
     trailer: Optional[str] = None
-    main_genre: Optional[str] = None
\ No newline at end of file
+    main_genre: Optional[str] = None
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class MovieFacetResult(BaseModel):
+    """Movies matching a filter, plus per-value counts for every facet"""
+    total: int
+    movie_ids: List[int]
+    facets: Dict[str, List[FacetCount]]
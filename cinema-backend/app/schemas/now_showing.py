@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+from app.schemas.movie import MovieRead
+
+class NowShowingShow(BaseModel):
+    show_id: int
+    date_time: datetime
+    duration: int
+    showroom_id: int
+    showroom: str
+    total_seats: int
+    remaining: int
+
+class NowShowingMovie(MovieRead):
+    shows: List[NowShowingShow]
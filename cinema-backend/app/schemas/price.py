@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic import ConfigDict
+from typing import List, Optional
 
 class PriceRead(BaseModel):
     prices_id: int
@@ -7,3 +8,25 @@ class PriceRead(BaseModel):
     amount: float
 
     model_config = ConfigDict(from_attributes=True)
+
+class PriceUpdate(BaseModel):
+    amount: float = Field(ge=0)
+
+class PriceQuoteRequest(BaseModel):
+    # one entry per seat, e.g. ["adult", "adult", "child"]
+    ticket_types: List[str] = Field(min_length=1, max_length=50)
+    promo_code: Optional[str] = None
+
+class PriceQuoteLine(BaseModel):
+    ticket_type: str
+    quantity: int
+    unit_amount: float
+    amount: float
+
+class PriceQuote(BaseModel):
+    lines: List[PriceQuoteLine]
+    subtotal: float
+    discount_percent: int
+    discount: float
+    total: float
+    promo_code: Optional[str] = None
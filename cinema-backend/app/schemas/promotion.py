@@ -19,3 +19,10 @@ class PromotionRead(PromotionBase):
     promotions_id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class PromotionValidation(BaseModel):
+    code: str
+    valid: bool
+    discount: Optional[int] = None
+    end_date: Optional[date] = None
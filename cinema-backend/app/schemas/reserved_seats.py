@@ -1,13 +1,31 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import List, Optional
 
 class ReservedSeatBase(BaseModel):
     show_id: int
     seat_id: int
     user_id: int
 
-class ReservedSeatCreate(ReservedSeatBase): ...
+class ReservedSeatCreate(BaseModel):
+    show_id: int
+    seat_id: int
+    # accepted for older clients but ignored; the holder is the token's user
+    user_id: Optional[int] = None
+
 class ReservedSeatRead(ReservedSeatBase):
     reserved_id: int
     booked_at: datetime
+    expires_at: datetime | None = None
     model_config = ConfigDict(from_attributes=True)
+
+class SeatHoldRequest(BaseModel):
+    show_id: int
+    # accepted for older clients but ignored; the holder is the token's user
+    user_id: Optional[int] = None
+    seat_ids: List[int] = Field(min_length=1)
+
+class SeatHoldRead(BaseModel):
+    show_id: int
+    seat_ids: List[int]
+    expires_at: datetime | None = None
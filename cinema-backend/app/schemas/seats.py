@@ -9,3 +9,9 @@ class SeatCreate(SeatBase): ...
 class SeatRead(SeatBase):
     seats_id: int
     model_config = ConfigDict(from_attributes=True)
+
+class ShowSeatCount(BaseModel):
+    show_id: int
+    total_seats: int
+    reserved: int
+    remaining: int
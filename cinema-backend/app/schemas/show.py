@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import List
 
 class ShowBase(BaseModel):
     movieid: int
@@ -11,3 +12,20 @@ class ShowCreate(ShowBase): ...
 class ShowRead(ShowBase):
     show_id: int
     model_config = ConfigDict(from_attributes=True)
+
+class ShowBulkCreate(BaseModel):
+    shows: List[ShowCreate] = Field(min_length=1, max_length=1000)
+
+class ShowBulkItemResult(BaseModel):
+    index: int
+    created: bool
+    show: ShowRead | None = None
+    # set when the item clashes with an existing show or with another item in the batch
+    conflicting_show_id: int | None = None
+    conflicting_index: int | None = None
+    detail: str | None = None
+
+class ShowBulkResult(BaseModel):
+    created: int
+    rejected: int
+    items: List[ShowBulkItemResult]
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List
 
 class ShowroomBase(BaseModel):
     name: str
@@ -8,3 +9,41 @@ class ShowroomCreate(ShowroomBase): ...
 class ShowroomRead(ShowroomBase):
     showroom_id: int
     model_config = ConfigDict(from_attributes=True)
+
+class ShowroomRowSpec(BaseModel):
+    row_no: str = Field(min_length=1, max_length=5)
+    seats: int = Field(ge=1, le=500)
+    # seat numbers left out of the row (aisles); numbering continues after them
+    gaps: List[int] = []
+
+    @model_validator(mode="after")
+    def _check_gaps(self):
+        if any(gap < 1 for gap in self.gaps) or len(set(self.gaps)) != len(self.gaps):
+            raise ValueError("gaps must be distinct positive seat numbers")
+        # the row spans seats + len(gaps) numbers; its first and last must be seats
+        last = self.seats + len(self.gaps)
+        if any(not 1 < gap < last for gap in self.gaps):
+            raise ValueError(f"gaps must fall between seats (2 to {last - 1} for this row)")
+        return self
+
+class ShowroomLayoutCreate(BaseModel):
+    name: str
+    rows: List[ShowroomRowSpec] = Field(min_length=1, max_length=100)
+
+    @model_validator(mode="after")
+    def _check_rows(self):
+        # seat rows are unique per showroom under the database's case-insensitive
+        # collation, so "a" and "A" would collide there as a misleading 400
+        if len({row.row_no.casefold() for row in self.rows}) != len(self.rows):
+            raise ValueError("row_no must be unique, ignoring case")
+        return self
+
+class ShowroomRowRead(BaseModel):
+    row_no: str
+    seats: int
+    # ordinal of the row's first seat in the showroom's seat ordering
+    first_ordinal: int
+    seat_nos: List[int]
+
+class ShowroomLayoutRead(ShowroomRead):
+    rows: List[ShowroomRowRead]
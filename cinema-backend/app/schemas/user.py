@@ -49,6 +49,13 @@ class UserRead(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserUpdateRead(UserRead):
+    # set only when the password changed: the caller's old tokens are revoked
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    token_type: Optional[str] = None
+
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -71,9 +78,14 @@ class UserStateUpdate(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
     user :Optional[UserRead] = None
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class PasswordResetRequest(BaseModel):
     email: EmailStr
 
@@ -0,0 +1,127 @@
+"""
+Card reads without per-request decryption.
+
+Cards store ``last_four`` and ``brand`` in plain text next to the Fernet
+encrypted number and CVC, so the card picker (``masked_card``) needs no
+decryption at all. Full decryption is only done by the explicit ``/full``
+endpoints, for a whole batch of cards in one worker-thread call, so it stays
+off the event loop.
+
+Cards saved before these columns existed are filled in by the backfill job:
+
+    python -m app.services.cards --batch-size 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.security import card_brand, card_last_four, decrypt_data
+from app.models.card import Card
+from app.schemas.card import CardMasked, CardRead
+
+
+def masked_card(card: Card) -> CardMasked:
+    return CardMasked(
+        card_id=card.card_id,
+        # keeps the shape clients already slice the last four digits from
+        number=f"************{card.last_four}" if card.last_four else "****",
+        last_four=card.last_four,
+        brand=card.brand,
+        address_id=card.address_id,
+        customer_id=card.customer_id,
+        exp_date=card.exp_date,
+    )
+
+
+def _decrypt_all(cards: Sequence[Card]) -> list[CardRead]:
+    return [
+        CardRead.model_validate(
+            {
+                "card_id": card.card_id,
+                "number": decrypt_data(card.number),
+                "cvc": decrypt_data(card.cvc),
+                "address_id": card.address_id,
+                "customer_id": card.customer_id,
+                "exp_date": card.exp_date,
+                "address": None,
+            }
+        )
+        for card in cards
+    ]
+
+
+async def decrypt_cards(cards: Sequence[Card]) -> list[CardRead]:
+    """Decrypt a batch of cards in one worker-thread call."""
+    if not cards:
+        return []
+    return await run_in_threadpool(_decrypt_all, cards)
+
+
+def _display_fields(numbers: list[tuple[int, str]]) -> list[dict]:
+    rows = []
+    for card_id, encrypted in numbers:
+        try:
+            number = decrypt_data(encrypted)
+        except Exception:
+            continue
+        last_four = card_last_four(number)
+        # cards without a usable number keep NULL and render as "****"
+        if last_four:
+            rows.append({"id": card_id, "last_four": last_four, "brand": card_brand(number)})
+    return rows
+
+
+async def backfill_batch(db: AsyncSession, batch_size: int, after_id: int = 0) -> tuple[int, int]:
+    """
+    Fill ``last_four``/``brand`` for up to ``batch_size`` cards past ``after_id``
+    that lack them; return (last card id scanned, how many were filled).
+    """
+    numbers = (
+        await db.execute(
+            select(Card.card_id, Card.number)
+            .where(Card.last_four.is_(None), Card.card_id > after_id)
+            .order_by(Card.card_id)
+            .limit(batch_size)
+        )
+    ).all()
+    if not numbers:
+        return after_id, 0
+    rows = await run_in_threadpool(_display_fields, [tuple(row) for row in numbers])
+    for row in rows:
+        await db.execute(
+            update(Card).where(Card.card_id == row["id"]).values(last_four=row["last_four"], brand=row["brand"])
+        )
+    await db.commit()
+    return numbers[-1].card_id, len(rows)
+
+
+async def backfill(db: AsyncSession, batch_size: int = 500) -> int:
+    # walk a card_id cursor so cards that cannot be filled are not rescanned
+    total = after_id = 0
+    while True:
+        last_id, written = await backfill_batch(db, batch_size, after_id)
+        if last_id == after_id:
+            return total
+        total += written
+        after_id = last_id
+
+
+async def _main(batch_size: int) -> None:
+    from app.core.db import async_session
+
+    async with async_session() as db:
+        written = await backfill(db, batch_size)
+    print(f"filled display fields for {written} cards")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_main(args.batch_size))
@@ -0,0 +1,137 @@
+"""
+In-process movie catalog cache.
+
+Holds every movie as a validated ``MovieRead`` plus the serialized JSON body and
+ETag of each list page served, so ``GET /movies/`` is a dict lookup and repeat
+visitors revalidate with ``If-None-Match`` without touching the database.
+
+The movie write endpoints update the cache after they commit (write-through)
+and bump ``version``; derived in-memory indexes register with ``add_listener``
+to be told about each change, and rebuild when ``get_movies`` hands them a
+different dict (a reload). Like the seat cache it is per process, so entries
+also expire after ``MOVIE_CATALOG_TTL_SECONDS`` to pick up writes made by
+other workers.
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.http_cache import body_etag
+from app.core.pagination import Page, page_of_sorted
+from app.models.movie import Movie
+from app.schemas.movie import MovieRead
+
+_movie_list = TypeAdapter(list[MovieRead])
+
+# movie_id -> MovieRead, kept in movie_id order; None until first loaded
+_movies: dict[int, MovieRead] | None = None
+_loaded_at = 0.0
+_ids: list[int] = []
+# (after, limit) -> (body, etag, next cursor key); emptied on every write
+_pages: dict[tuple[int | None, int], tuple[bytes, str, int | None]] = {}
+_MAX_PAGES = 256
+# called with (movie_id, movie or None when deleted) after each write to a loaded catalog
+_listeners: list[Callable[[int, MovieRead | None], None]] = []
+# bumped on every write, including writes that race with a reload
+version = 0
+
+
+def _expired() -> bool:
+    return time.monotonic() - _loaded_at > settings.MOVIE_CATALOG_TTL_SECONDS
+
+
+async def get_movies(db: AsyncSession) -> dict[int, MovieRead]:
+    """Return the cached catalog keyed by movie_id, loading it on a miss."""
+    global _movies, _loaded_at, _ids
+    if _movies is not None and not _expired():
+        return _movies
+
+    started_at = version
+    rows = (await db.execute(select(Movie).order_by(Movie.movie_id))).scalars().all()
+    movies = {movie.movie_id: MovieRead.model_validate(movie) for movie in rows}
+    # a write committed while we were reading may be missing from ``rows``
+    if version == started_at:
+        _movies = movies
+        _loaded_at = time.monotonic()
+        _ids = list(movies)
+        _pages.clear()
+    return movies
+
+
+async def get_catalog_page(db: AsyncSession, page: Page) -> tuple[bytes, str, int | None]:
+    """Return (JSON body, ETag, next cursor key) for one page of the catalog."""
+    movies = await get_movies(db)
+    cacheable = movies is _movies
+    key = (page.after, page.limit)
+    if cacheable and key in _pages:
+        return _pages[key]
+
+    ids = _ids if cacheable else list(movies)
+    start, stop, next_after = page_of_sorted(ids, page)
+    body = _movie_list.dump_json([movies[movie_id] for movie_id in ids[start:stop]])
+    result = (body, body_etag(body), next_after)
+    if cacheable:
+        if len(_pages) >= _MAX_PAGES:
+            _pages.clear()
+        _pages[key] = result
+    return result
+
+
+def add_listener(listener: Callable[[int, MovieRead | None], None]) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _notify(movie_id: int, movie: MovieRead | None) -> None:
+    for listener in _listeners:
+        listener(movie_id, movie)
+
+
+def peek_movie(movie_id: int) -> MovieRead | None:
+    """Return a cached movie without touching the DB, if the catalog is loaded."""
+    if _movies is None or _expired():
+        return None
+    return _movies.get(movie_id)
+
+
+def movie_saved(movie: Movie) -> MovieRead:
+    """Write a committed insert/update through to the cache."""
+    global _ids, version
+    version += 1
+    read = MovieRead.model_validate(movie)
+    if _movies is not None:
+        is_new = movie.movie_id not in _movies
+        _movies[movie.movie_id] = read
+        if is_new:
+            if _ids and movie.movie_id < _ids[-1]:
+                # re-sort in place so listeners keep seeing the same dict
+                ordered = sorted(_movies.items())
+                _movies.clear()
+                _movies.update(ordered)
+            _ids = list(_movies)
+        _pages.clear()
+        _notify(movie.movie_id, read)
+    return read
+
+
+def movie_deleted(movie_id: int) -> None:
+    global _ids, version
+    version += 1
+    if _movies is not None and _movies.pop(movie_id, None) is not None:
+        _ids = list(_movies)
+        _pages.clear()
+        _notify(movie_id, None)
+
+
+def invalidate_catalog() -> None:
+    global _movies, _ids, version
+    version += 1
+    _movies = None
+    _ids = []
+    _pages.clear()
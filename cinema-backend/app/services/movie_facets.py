@@ -0,0 +1,177 @@
+"""
+Faceted filtering over the movie catalog.
+
+Every cached movie gets a bit position, and every facet value keeps a Python
+int with the bits of the movies that have it. A filter is a few ANDs/ORs over
+those ints; counts are ``int.bit_count()`` of the value's bits intersected
+with the selection from the *other* facets, so picking "Action" still shows
+how many "Comedy" movies there are under the remaining filters.
+
+Release dates are kept sorted so a date window becomes a bitmask with two
+bisects. Like the search index, the facets are built from the catalog cache
+and updated through its write listeners.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.movie import FacetCount, MovieFacetResult, MovieRead
+from app.services import movie_catalog
+
+# facet name -> how to read its value from a movie
+FACETS = {
+    "main_genre": lambda movie: movie.main_genre,
+    "rating": lambda movie: movie.rating,
+    "available": lambda movie: "true" if movie.available else "false",
+    "release_year": lambda movie: str(movie.release_date.year) if movie.release_date else None,
+}
+
+
+class FacetIndex:
+    def __init__(self) -> None:
+        self._bits: dict[int, int] = {}
+        self._movie_ids: list[int | None] = []
+        self._all = 0
+        self._values: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        self._movie_values: dict[int, dict[str, str | None]] = {}
+        # (release_date, movie_id), sorted, for date windows
+        self._released: list[tuple[datetime, int]] = []
+        self._release_dates: dict[int, datetime] = {}
+
+    @classmethod
+    def build(cls, movies: dict[int, MovieRead]) -> "FacetIndex":
+        index = cls()
+        for movie in movies.values():
+            index.add(movie)
+        return index
+
+    def add(self, movie: MovieRead) -> None:
+        # an update keeps the movie's bit; deleted slots are only reclaimed
+        # when a catalog reload rebuilds the index
+        bit = self.remove(movie.movie_id)
+        if bit is None:
+            bit = 1 << len(self._movie_ids)
+            self._movie_ids.append(movie.movie_id)
+        self._movie_ids[bit.bit_length() - 1] = movie.movie_id
+        self._bits[movie.movie_id] = bit
+        self._all |= bit
+
+        values = {facet: read(movie) for facet, read in FACETS.items()}
+        self._movie_values[movie.movie_id] = values
+        for facet, value in values.items():
+            if value is not None:
+                by_value = self._values[facet]
+                by_value[value] = by_value.get(value, 0) | bit
+        if movie.release_date:
+            released = _naive(movie.release_date)
+            self._release_dates[movie.movie_id] = released
+            insort(self._released, (released, movie.movie_id))
+
+    def remove(self, movie_id: int) -> int | None:
+        """Drop a movie; return the bit it occupied, if any."""
+        bit = self._bits.pop(movie_id, None)
+        if bit is None:
+            return None
+        self._movie_ids[bit.bit_length() - 1] = None
+        self._all &= ~bit
+        for facet, value in self._movie_values.pop(movie_id).items():
+            if value is None:
+                continue
+            by_value = self._values[facet]
+            by_value[value] &= ~bit
+            if not by_value[value]:
+                del by_value[value]
+        released = self._release_dates.pop(movie_id, None)
+        if released is not None:
+            del self._released[bisect_left(self._released, (released, movie_id))]
+        return bit
+
+    def _window(self, released_from: datetime | None, released_to: datetime | None) -> int:
+        lo = bisect_left(self._released, (_naive(released_from),)) if released_from else 0
+        hi = bisect_right(self._released, (_naive(released_to), float("inf"))) if released_to else len(self._released)
+        mask = 0
+        for _, movie_id in self._released[lo:hi]:
+            mask |= self._bits[movie_id]
+        return mask
+
+    def _ids(self, mask: int) -> list[int]:
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(self._movie_ids[low.bit_length() - 1])
+            mask ^= low
+        return sorted(ids)
+
+    def query(
+        self,
+        selected: dict[str, list[str]],
+        released_from: datetime | None = None,
+        released_to: datetime | None = None,
+    ) -> MovieFacetResult:
+        """
+        ``selected`` maps facet name to accepted values (OR within a facet,
+        AND across facets); an empty or missing list means no filter.
+        """
+        window = self._window(released_from, released_to) if released_from or released_to else self._all
+        masks = {}
+        for facet, values in selected.items():
+            if values:
+                by_value = self._values[facet]
+                mask = 0
+                for value in values:
+                    mask |= by_value.get(value, 0)
+                masks[facet] = mask
+
+        matched = window
+        for mask in masks.values():
+            matched &= mask
+
+        facets = {}
+        for facet, by_value in self._values.items():
+            # counts for a facet ignore that facet's own selection
+            others = window
+            for other, mask in masks.items():
+                if other != facet:
+                    others &= mask
+            facets[facet] = [
+                FacetCount(value=value, count=(bits & others).bit_count())
+                for value, bits in sorted(by_value.items())
+            ]
+        return MovieFacetResult(total=matched.bit_count(), movie_ids=self._ids(matched), facets=facets)
+
+
+def _naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None)
+
+
+_index: FacetIndex | None = None
+_source: dict[int, MovieRead] | None = None
+
+
+def _on_movie_change(movie_id: int, movie: MovieRead | None) -> None:
+    if _index is None:
+        return
+    if movie is None:
+        _index.remove(movie_id)
+    else:
+        _index.add(movie)
+
+
+movie_catalog.add_listener(_on_movie_change)
+
+
+async def filter_movies(
+    db: AsyncSession,
+    selected: dict[str, list[str]],
+    released_from: datetime | None = None,
+    released_to: datetime | None = None,
+) -> MovieFacetResult:
+    global _index, _source
+    movies = await movie_catalog.get_movies(db)
+    if _index is None or movies is not _source:
+        _index = FacetIndex.build(movies)
+        _source = movies
+    return _index.query(selected, released_from, released_to)
@@ -0,0 +1,174 @@
+"""
+In-process full-text search over the movie catalog.
+
+An inverted index maps each token of ``name``, ``main_genre`` and
+``description`` to the movies containing it, weighted by field. Every query
+term is matched as a prefix (so type-ahead works on partial words) through a
+sorted vocabulary, all terms must match, and results are ranked by the sum of
+field weight x IDF, with exact word matches beating prefix matches.
+
+The index is built from the catalog cache and kept up to date through the
+catalog's write listeners, so queries never touch the database once the
+catalog is loaded.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.movie import MovieRead
+from app.services import movie_catalog
+
+FIELD_WEIGHTS = (("name", 3.0), ("main_genre", 2.0), ("description", 1.0))
+# a prefix-only match counts for this fraction of an exact word match
+PREFIX_FACTOR = 0.6
+# merged and ranked postings are cached for prefixes up to this length, the
+# ones that expand to most of the vocabulary
+_CACHED_PREFIX_LEN = 2
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    text = text.casefold()
+    if not text.isascii():
+        # accent-insensitive: "Amélie" matches "amelie"
+        folded = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in folded if not unicodedata.combining(c))
+    return _TOKEN.findall(text)
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[int, float]] = {}
+        self._vocab: list[str] = []
+        self._doc_terms: dict[int, dict[str, float]] = {}
+        self._prefix_cache: dict[str, tuple[dict[int, float], list[tuple[int, float]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    @classmethod
+    def build(cls, movies: dict[int, MovieRead]) -> "SearchIndex":
+        index = cls()
+        for movie in movies.values():
+            index._add(movie, keep_sorted=False)
+        index._vocab.sort()
+        return index
+
+    def add(self, movie: MovieRead) -> None:
+        self._add(movie, keep_sorted=True)
+
+    def _add(self, movie: MovieRead, keep_sorted: bool) -> None:
+        self.remove(movie.movie_id)
+        terms: dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS:
+            for token in set(tokenize(getattr(movie, field))):
+                terms[token] += weight
+        self._doc_terms[movie.movie_id] = terms
+        for token, weight in terms.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                if keep_sorted:
+                    insort(self._vocab, token)
+                else:
+                    self._vocab.append(token)
+            posting[movie.movie_id] = weight
+        self._prefix_cache.clear()
+
+    def remove(self, movie_id: int) -> None:
+        terms = self._doc_terms.pop(movie_id, None)
+        if not terms:
+            return
+        for token in terms:
+            posting = self._postings[token]
+            del posting[movie_id]
+            if not posting:
+                del self._postings[token]
+                del self._vocab[bisect_left(self._vocab, token)]
+        self._prefix_cache.clear()
+
+    def _idf(self, token: str) -> float:
+        return math.log(1 + len(self._doc_terms) / len(self._postings[token]))
+
+    def _match(self, term: str) -> dict[int, float]:
+        """Best score per movie for one query term, over all tokens it prefixes."""
+        cached = self._prefix_cache.get(term)
+        if cached is not None:
+            return cached[0]
+
+        scores: dict[int, float] = {}
+        start = bisect_left(self._vocab, term)
+        for i in range(start, len(self._vocab)):
+            token = self._vocab[i]
+            if not token.startswith(term):
+                break
+            factor = self._idf(token) * (1.0 if token == term else PREFIX_FACTOR)
+            for movie_id, weight in self._postings[token].items():
+                score = weight * factor
+                if score > scores.get(movie_id, 0.0):
+                    scores[movie_id] = score
+
+        if len(term) <= _CACHED_PREFIX_LEN:
+            self._prefix_cache[term] = (scores, _rank(scores, len(scores)))
+        return scores
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[int, float]]:
+        """Return up to ``limit`` (movie_id, score) pairs, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        if len(terms) == 1:
+            cached = self._prefix_cache.get(terms[0])
+            if cached is not None:
+                return cached[1][:limit]
+            return _rank(self._match(terms[0]), limit)
+
+        # intersect starting from the rarest term so the candidate set stays small
+        matches = sorted((self._match(term) for term in terms), key=len)
+        totals = matches[0]
+        for scores in matches[1:]:
+            totals = {movie_id: total + scores[movie_id] for movie_id, total in totals.items() if movie_id in scores}
+            if not totals:
+                return []
+        return _rank(totals, limit)
+
+
+def _rank(scores: dict[int, float], limit: int) -> list[tuple[int, float]]:
+    # ties go to the lower movie_id so results are stable
+    return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+_index: SearchIndex | None = None
+_source: dict[int, MovieRead] | None = None
+
+
+def _on_movie_change(movie_id: int, movie: MovieRead | None) -> None:
+    if _index is None:
+        return
+    if movie is None:
+        _index.remove(movie_id)
+    else:
+        _index.add(movie)
+
+
+movie_catalog.add_listener(_on_movie_change)
+
+
+async def search_movies(db: AsyncSession, query: str, limit: int = 20) -> list[MovieRead]:
+    global _index, _source
+    movies = await movie_catalog.get_movies(db)
+    # a different dict means the catalog was reloaded; rebuild from it
+    if _index is None or movies is not _source:
+        _index = SearchIndex.build(movies)
+        _source = movies
+    return [movies[movie_id] for movie_id, _ in _index.search(query, limit) if movie_id in movies]
@@ -0,0 +1,163 @@
+"""
+Materialized "now showing" snapshot for the landing page.
+
+One grouped query loads every upcoming show of an available movie within
+``NOW_SHOWING_DAYS`` together with its showroom and remaining seats. The rows
+are kept in memory with the serialized response body and its ETag.
+
+Writes do not recompute it. Seat changes (through the seat cache listener),
+show writes and movie writes (through the catalog listener) only mark their
+show or movie dirty, and the next request re-queries just those rows. Shows
+that have started drop out on read. A full rebuild runs every
+``NOW_SHOWING_REFRESH_SECONDS`` to pick up new days and other workers' writes.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import body_etag
+from app.models.movie import Movie
+from app.models.reserved_seats import ReservedSeat
+from app.models.show import Show
+from app.models.showroom import Showroom
+from app.schemas.movie import MovieRead
+from app.schemas.now_showing import NowShowingMovie, NowShowingShow
+from app.services import movie_catalog, seat_availability
+
+
+class _ShowRow(NamedTuple):
+    movie_id: int
+    show: NowShowingShow
+
+
+_now_showing_list = TypeAdapter(list[NowShowingMovie])
+
+_shows: dict[int, _ShowRow] | None = None
+_built_at = 0.0
+_dirty_shows: set[int] = set()
+_dirty_movies: set[int] = set()
+_body: tuple[bytes, str] | None = None
+# start of the earliest show in the body; once it has begun the body is rebuilt
+_body_expires: datetime | None = None
+
+
+def mark_show_dirty(show_id: int) -> None:
+    _dirty_shows.add(show_id)
+
+
+def mark_movie_dirty(movie_id: int, _movie: MovieRead | None = None) -> None:
+    _dirty_movies.add(movie_id)
+
+
+seat_availability.add_listener(mark_show_dirty)
+movie_catalog.add_listener(mark_movie_dirty)
+
+
+def _now() -> datetime:
+    # show times are stored as naive local wall-clock times
+    return datetime.now()
+
+
+async def _load(db: AsyncSession, *criteria) -> dict[int, _ShowRow]:
+    now = _now()
+    rows = await db.execute(
+        select(
+            Show.show_id,
+            Show.movieid,
+            Show.date_time,
+            Show.duration,
+            Show.showroom_id,
+            Showroom.name,
+            seat_availability.show_seat_total(),
+            func.count(ReservedSeat.reserved_id),
+        )
+        .join(Showroom, Showroom.showroom_id == Show.showroom_id)
+        .join(Movie, Movie.movie_id == Show.movieid)
+        .outerjoin(
+            ReservedSeat,
+            (ReservedSeat.show_id == Show.show_id) & seat_availability.live_reservation(),
+        )
+        .where(
+            Movie.available.is_(True),
+            Show.date_time >= now,
+            Show.date_time < now + timedelta(days=settings.NOW_SHOWING_DAYS),
+            *criteria,
+        )
+        .group_by(
+            Show.show_id,
+            Show.movieid,
+            Show.date_time,
+            Show.duration,
+            Show.showroom_id,
+            Showroom.name,
+        )
+    )
+    return {
+        show_id: _ShowRow(
+            movie_id,
+            NowShowingShow(
+                show_id=show_id,
+                date_time=date_time,
+                duration=duration,
+                showroom_id=showroom_id,
+                showroom=showroom,
+                total_seats=total,
+                remaining=max(total - reserved, 0),
+            ),
+        )
+        for show_id, movie_id, date_time, duration, showroom_id, showroom, total, reserved in rows.all()
+    }
+
+
+async def _refresh(db: AsyncSession) -> bool:
+    """Bring the snapshot up to date; return True if it changed."""
+    global _shows, _built_at
+    if _shows is None or time.monotonic() - _built_at > settings.NOW_SHOWING_REFRESH_SECONDS:
+        _dirty_shows.clear()
+        _dirty_movies.clear()
+        _built_at = time.monotonic()
+        _shows = await _load(db)
+        return True
+
+    if not _dirty_shows and not _dirty_movies:
+        return False
+    # take the dirty sets first so marks made while we query are kept for next time
+    show_ids, movie_ids = set(_dirty_shows), set(_dirty_movies)
+    _dirty_shows.clear()
+    _dirty_movies.clear()
+    fresh = await _load(db, or_(Show.show_id.in_(show_ids), Show.movieid.in_(movie_ids)))
+    for show_id in [s for s, row in _shows.items() if s in show_ids or row.movie_id in movie_ids]:
+        del _shows[show_id]
+    _shows.update(fresh)
+    return True
+
+
+async def get_now_showing_body(db: AsyncSession) -> tuple[bytes, str]:
+    """Return (JSON body, ETag) of the current now-showing list."""
+    global _body, _body_expires
+    changed = await _refresh(db)
+    now = _now()
+    if _body is not None and not changed and (_body_expires is None or now < _body_expires):
+        return _body
+
+    movies = await movie_catalog.get_movies(db)
+    by_movie: dict[int, list[NowShowingShow]] = {}
+    for movie_id, show in sorted(_shows.values(), key=lambda row: row.show.date_time):
+        if show.date_time >= now and movie_id in movies:
+            by_movie.setdefault(movie_id, []).append(show)
+
+    listing = [
+        NowShowingMovie(**movies[movie_id].model_dump(), shows=shows)
+        for movie_id, shows in sorted(by_movie.items(), key=lambda item: movies[item[0]].name.casefold())
+    ]
+    body = _now_showing_list.dump_json(listing)
+    _body = (body, body_etag(body))
+    _body_expires = min((shows[0].date_time for shows in by_movie.values()), default=None)
+    return _body
@@ -0,0 +1,139 @@
+"""
+Denormalized order summaries for ``/orders/history``.
+
+Checkout writes one ``order_summaries`` row per booking in the booking's own
+transaction, carrying everything the history page shows (movie and showroom
+names, show time, seat labels, reserved seats). History is then a single
+keyset read on ``(user_id, booking_id)``.
+
+Bookings made before the table existed are filled in by the backfill job:
+
+    python -m app.services.order_summaries --batch-size 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.booking import Booking
+from app.models.movie import Movie
+from app.models.order_summary import OrderSummary
+from app.models.reserved_seats import ReservedSeat
+from app.models.seats import Seat
+from app.models.show import Show
+from app.models.showroom import Showroom
+from app.schemas.booking import BookingRead
+from app.schemas.reserved_seats import ReservedSeatRead
+
+
+def summary_values(
+    booking: Booking,
+    reserved: Sequence[ReservedSeat | ReservedSeatRead],
+    movie_name: str | None,
+    showroom_name: str | None,
+    show_time: datetime | None,
+    seat_labels: list[str],
+) -> dict:
+    return {
+        "booking_id": booking.booking_id,
+        "user_id": booking.user_id,
+        "show_id": booking.show_id,
+        "total_amount": booking.total_amount,
+        "created_at": booking.created_at,
+        "movie_name": movie_name,
+        "showroom_name": showroom_name,
+        "show_time": show_time,
+        "seat_labels": seat_labels,
+        "reserved_seats": [ReservedSeatRead.model_validate(rs).model_dump(mode="json") for rs in reserved],
+    }
+
+
+def booking_read(summary: OrderSummary) -> BookingRead:
+    return BookingRead(
+        booking_id=summary.booking_id,
+        user_id=summary.user_id,
+        show_id=summary.show_id,
+        total_amount=summary.total_amount,
+        created_at=summary.created_at,
+        reserved_seats=summary.reserved_seats,
+        movie_name=summary.movie_name,
+        showroom=summary.showroom_name,
+        seat_labels=summary.seat_labels,
+    )
+
+
+async def backfill_batch(db: AsyncSession, batch_size: int) -> int:
+    """Write summaries for up to ``batch_size`` bookings that lack one; return how many."""
+    missing = select(OrderSummary.booking_id).where(OrderSummary.booking_id == Booking.booking_id)
+    bookings = (
+        await db.execute(
+            select(Booking)
+            .where(~missing.exists())
+            .options(selectinload(Booking.reserved_seats))
+            .order_by(Booking.booking_id)
+            .limit(batch_size)
+        )
+    ).scalars().all()
+    if not bookings:
+        return 0
+
+    show_ids = {b.show_id for b in bookings}
+    shows = {
+        row.show_id: row
+        for row in await db.execute(
+            select(Show.show_id, Show.date_time, Movie.name.label("movie_name"), Showroom.name.label("showroom_name"))
+            .outerjoin(Movie, Movie.movie_id == Show.movieid)
+            .outerjoin(Showroom, Showroom.showroom_id == Show.showroom_id)
+            .where(Show.show_id.in_(show_ids))
+        )
+    }
+    seat_ids = {rs.seat_id for b in bookings for rs in b.reserved_seats}
+    labels = {
+        row.seats_id: f"{row.row_no}{row.seat_no}"
+        for row in await db.execute(select(Seat.seats_id, Seat.row_no, Seat.seat_no).where(Seat.seats_id.in_(seat_ids)))
+    }
+
+    rows = []
+    for booking in bookings:
+        show = shows.get(booking.show_id)
+        rows.append(
+            summary_values(
+                booking,
+                booking.reserved_seats,
+                movie_name=show.movie_name if show else None,
+                showroom_name=show.showroom_name if show else None,
+                show_time=show.date_time if show else None,
+                seat_labels=sorted(labels[rs.seat_id] for rs in booking.reserved_seats if rs.seat_id in labels),
+            )
+        )
+    await db.execute(insert(OrderSummary).values(rows))
+    await db.commit()
+    return len(rows)
+
+
+async def backfill(db: AsyncSession, batch_size: int = 500) -> int:
+    total = 0
+    while written := await backfill_batch(db, batch_size):
+        total += written
+    return total
+
+
+async def _main(batch_size: int) -> None:
+    from app.core.db import async_session
+
+    async with async_session() as db:
+        written = await backfill(db, batch_size)
+    print(f"wrote {written} order summaries")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_main(args.batch_size))
@@ -0,0 +1,123 @@
+"""
+Server-side ticket pricing.
+
+The ``prices`` table (ticket type -> amount) is tiny and rarely changes, so it
+is held in process and reloaded after ``PRICE_CACHE_TTL_SECONDS``, or right
+away when ``PUT /prices/{ticket_type}`` calls ``invalidate_prices``. Edits
+made straight in the database show up once the TTL runs out.
+
+A quote counts the cart's ticket types once and multiplies each count by its
+unit price, so pricing a cart needs no query while the table is cached.
+Amounts are ``Decimal`` and rounded to cents.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import response_cache
+from app.core.config import settings
+from app.models.price import Price
+from app.schemas.price import PriceRead
+from app.services import promotions
+
+CENT = Decimal("0.01")
+
+
+class PricingError(ValueError):
+    """The cart cannot be priced (unknown ticket type or unusable promo code)."""
+
+
+@dataclass(slots=True, frozen=True)
+class QuoteLine:
+    ticket_type: str
+    quantity: int
+    unit_amount: Decimal
+    amount: Decimal
+
+
+@dataclass(slots=True, frozen=True)
+class Quote:
+    lines: tuple[QuoteLine, ...]
+    subtotal: Decimal
+    discount_percent: int
+    discount: Decimal
+    total: Decimal
+    promo_code: str | None = None
+
+
+# lowercased ticket type -> row; None until first loaded
+_rows: dict[str, PriceRead] | None = None
+_prices: dict[str, Decimal] = {}
+_loaded_at = 0.0
+
+
+async def get_price_rows(db: AsyncSession) -> dict[str, PriceRead]:
+    """Return {ticket type: PriceRead}, loading the prices table on a miss."""
+    global _rows, _prices, _loaded_at
+    if _rows is None or time.monotonic() - _loaded_at > settings.PRICE_CACHE_TTL_SECONDS:
+        prices = (await db.execute(select(Price).order_by(Price.prices_id))).scalars().all()
+        _rows = {price.type.lower(): PriceRead.model_validate(price) for price in prices}
+        _prices = {price.type.lower(): Decimal(str(price.amount)) for price in prices}
+        _loaded_at = time.monotonic()
+    return _rows
+
+
+async def get_price_table(db: AsyncSession) -> dict[str, Decimal]:
+    """Return {ticket type: amount} from the cached prices table."""
+    await get_price_rows(db)
+    return _prices
+
+
+def invalidate_prices() -> None:
+    global _rows
+    _rows = None
+    response_cache.invalidate("prices")
+
+
+async def promotion_discount(db: AsyncSession, code: str) -> int:
+    """Discount percent of an active promotion code; raises PricingError otherwise."""
+    promo = await promotions.find_active(db, code)
+    if promo is None:
+        raise PricingError(f"Promotion code {code!r} is not valid")
+    return promo.discount
+
+
+def price_tickets(
+    table: dict[str, Decimal],
+    ticket_types: Iterable[str],
+    discount_percent: int = 0,
+    promo_code: str | None = None,
+) -> Quote:
+    counts = Counter(ticket_type.lower() for ticket_type in ticket_types)
+    unknown = sorted(ticket_type for ticket_type in counts if ticket_type not in table)
+    if unknown:
+        raise PricingError(f"Unknown ticket type(s): {unknown}")
+
+    lines = tuple(
+        QuoteLine(ticket_type, quantity, table[ticket_type], table[ticket_type] * quantity)
+        for ticket_type, quantity in sorted(counts.items())
+    )
+    subtotal = sum((line.amount for line in lines), Decimal("0")).quantize(CENT)
+    discount = (subtotal * discount_percent / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+    return Quote(
+        lines=lines,
+        subtotal=subtotal,
+        discount_percent=discount_percent,
+        discount=discount,
+        total=max(subtotal - discount, Decimal("0")),
+        promo_code=promo_code,
+    )
+
+
+async def quote_order(db: AsyncSession, ticket_types: list[str], promo_code: str | None = None) -> Quote:
+    """Price one ticket per entry of ``ticket_types``, applying ``promo_code`` if given."""
+    table = await get_price_table(db)
+    discount_percent = await promotion_discount(db, promo_code) if promo_code else 0
+    return price_tickets(table, ticket_types, discount_percent, promo_code)
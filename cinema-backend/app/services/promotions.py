@@ -0,0 +1,112 @@
+"""
+In-process promotion index.
+
+Promo codes are checked on every keystroke in the cart, so every promotion is
+held in memory keyed by its casefolded code (MySQL's default collation
+compares codes case-insensitively too) next to a list of promotions sorted by
+start date. The promotions active on a given day are found by bisecting that
+list and are cached until the date changes.
+
+The admin endpoints write new and deleted promotions through after they
+commit; the index is also reloaded after ``PROMOTION_CACHE_TTL_SECONDS`` to
+pick up writes made by other workers.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.promotion import Promotion
+from app.schemas.promotion import PromotionRead
+
+# casefolded code -> promotion; None until first loaded
+_by_code: dict[str, PromotionRead] | None = None
+# (start_date or date.min, promotions_id, promotion), sorted
+_by_start: list[tuple[date, int, PromotionRead]] = []
+_active_on: date | None = None
+_active: list[PromotionRead] = []
+_loaded_at = 0.0
+# bumped on every write, including writes that race with a reload
+version = 0
+
+
+def _key(code: str) -> str:
+    return code.strip().casefold()
+
+
+def is_active(promo: PromotionRead, today: date) -> bool:
+    return (promo.start_date is None or promo.start_date <= today) and (
+        promo.end_date is None or promo.end_date >= today
+    )
+
+
+def _install(promos: list[PromotionRead]) -> None:
+    global _by_code, _by_start, _active_on
+    _by_code = {_key(promo.code): promo for promo in promos}
+    _by_start = sorted((promo.start_date or date.min, promo.promotions_id, promo) for promo in promos)
+    _active_on = None
+
+
+async def _ensure_loaded(db: AsyncSession) -> dict[str, PromotionRead]:
+    global _loaded_at
+    if _by_code is not None and time.monotonic() - _loaded_at <= settings.PROMOTION_CACHE_TTL_SECONDS:
+        return _by_code
+
+    started_at = version
+    rows = (await db.execute(select(Promotion))).scalars().all()
+    promos = [PromotionRead.model_validate(promo) for promo in rows]
+    # a write committed while we were reading may be missing from ``rows``
+    if version != started_at:
+        return {_key(promo.code): promo for promo in promos}
+    _install(promos)
+    _loaded_at = time.monotonic()
+    return _by_code
+
+
+async def find_active(db: AsyncSession, code: str, today: date | None = None) -> PromotionRead | None:
+    """Return the promotion for ``code`` if it is active on ``today``."""
+    promo = (await _ensure_loaded(db)).get(_key(code))
+    if promo is None or not is_active(promo, today or date.today()):
+        return None
+    return promo
+
+
+async def active_promotions(db: AsyncSession, today: date | None = None) -> list[PromotionRead]:
+    """Promotions running on ``today``, by start date."""
+    global _active_on, _active
+    await _ensure_loaded(db)
+    today = today or date.today()
+    if _active_on != today:
+        started = _by_start[: bisect_right(_by_start, (today, float("inf")))]
+        _active = [promo for _, _, promo in started if promo.end_date is None or promo.end_date >= today]
+        _active_on = today
+    return _active
+
+
+def promotion_saved(promo: Promotion) -> PromotionRead:
+    """Write a committed insert through to the index."""
+    global version
+    version += 1
+    read = PromotionRead.model_validate(promo)
+    if _by_code is not None:
+        promos = [other for other in _by_code.values() if other.promotions_id != read.promotions_id]
+        _install([*promos, read])
+    return read
+
+
+def promotion_deleted(promotion_id: int) -> None:
+    global version
+    version += 1
+    if _by_code is not None:
+        _install([promo for promo in _by_code.values() if promo.promotions_id != promotion_id])
+
+
+def invalidate_promotions() -> None:
+    global _by_code, version
+    version += 1
+    _by_code = None
@@ -0,0 +1,102 @@
+"""
+Showroom schedule conflict detection.
+
+Shows in one showroom never overlap, so for a candidate slot [start, end)
+only two kinds of existing show can conflict: the last show that started
+before ``start`` (it may still be running), and any show starting inside the
+slot. Both are range lookups on the ``uq_show_conflict (showroom_id,
+date_time)`` index, so the cost depends on the size of the window, not on how
+much schedule history the showroom has.
+"""
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.show import Show
+
+
+def show_end(start: datetime, duration: int) -> datetime:
+    return start + timedelta(minutes=duration)
+
+
+def overlaps(start: datetime, end: datetime, other_start: datetime, other_end: datetime) -> bool:
+    # compare as timestamps so naive and aware datetimes mix the way they always have
+    return start.timestamp() < other_end.timestamp() and end.timestamp() > other_start.timestamp()
+
+
+async def load_shows_in_window(
+    db: AsyncSession,
+    showroom_id: int,
+    start: datetime,
+    end: datetime,
+) -> list[Show]:
+    """
+    Shows in the showroom that could overlap [start, end): every show starting
+    inside the window plus the last one starting before it, ordered by start.
+    """
+    previous_start = (
+        select(func.max(Show.date_time))
+        .where(Show.showroom_id == showroom_id, Show.date_time < start)
+        .scalar_subquery()
+    )
+    res = await db.execute(
+        select(Show)
+        .where(
+            Show.showroom_id == showroom_id,
+            Show.date_time >= func.coalesce(previous_start, start),
+            Show.date_time < end,
+        )
+        .order_by(Show.date_time)
+    )
+    return list(res.scalars())
+
+
+async def find_conflicting_show(
+    db: AsyncSession,
+    showroom_id: int,
+    start: datetime,
+    duration: int,
+) -> Show | None:
+    """Return an existing show in the showroom that overlaps the new slot, if any."""
+    end = show_end(start, duration)
+    for scheduled in await load_shows_in_window(db, showroom_id, start, end):
+        if overlaps(start, end, scheduled.date_time, show_end(scheduled.date_time, scheduled.duration)):
+            return scheduled
+    return None
+
+
+def sweep_conflicts(
+    existing: list[Show],
+    candidates: list[tuple[int, datetime, int]],
+) -> dict[int, tuple[str, int]]:
+    """
+    Check a batch of (index, start, duration) slots for one showroom against
+    its existing shows and against each other in one pass in start order.
+
+    Returns {index: ("show", show_id) | ("item", other_index)} for every
+    rejected slot. Within the batch the earlier slot wins, ties going to the
+    lower index.
+    """
+    # existing shows never overlap, so sorted by start their ends increase too
+    existing = sorted(existing, key=lambda s: s.date_time.timestamp())
+    starts = [s.date_time.timestamp() for s in existing]
+    ends = [show_end(s.date_time, s.duration).timestamp() for s in existing]
+
+    conflicts: dict[int, tuple[str, int]] = {}
+    last_end = float("-inf")
+    last_index = -1
+    for index, start, duration in sorted(candidates, key=lambda c: (c[1].timestamp(), c[0])):
+        start_ts = start.timestamp()
+        end_ts = show_end(start, duration).timestamp()
+        i = bisect_left(starts, start_ts)
+        if i > 0 and ends[i - 1] > start_ts:
+            conflicts[index] = ("show", existing[i - 1].show_id)
+        elif i < len(starts) and starts[i] < end_ts:
+            conflicts[index] = ("show", existing[i].show_id)
+        elif last_end > start_ts:
+            conflicts[index] = ("item", last_index)
+        else:
+            last_end, last_index = end_ts, index
+    return conflicts
@@ -0,0 +1,111 @@
+"""
+Best-available seat allocation.
+
+Finds the contiguous block of free seats in one row whose centre is closest
+to the screen centre: horizontally the middle of the row, and in depth the
+"sweet spot" row a little behind the middle of the room. Distance is squared
+Euclidean, in seats and rows.
+
+The per-showroom grid is precomputed once per layout; a lookup only walks the
+free runs of each row segment that fit the party (found with a C-level
+regex over the availability bitmap) and stops as soon as no nearer row can win.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.services.seat_layout import ShowroomLayout
+
+# fraction of the way from the front row to the back row that scores best
+SWEET_SPOT = 0.6
+
+
+@lru_cache(maxsize=32)
+def _free_run(party_size: int) -> re.Pattern[bytes]:
+    # only runs long enough for the party ever reach Python
+    return re.compile(b"\x00{%d,}" % party_size)
+
+
+@dataclass(slots=True, frozen=True)
+class SeatGrid:
+    # (squared row distance from the sweet spot, row index), nearest first
+    row_order: tuple[tuple[float, int], ...]
+    # per row: (start ordinal, end ordinal)
+    row_bounds: tuple[tuple[int, int], ...]
+    # per row: (start ordinal, end ordinal, seat number at start) of each segment
+    row_segments: tuple[tuple[tuple[int, int, int], ...], ...]
+    row_centers: tuple[float, ...]
+
+    @classmethod
+    def from_layout(cls, layout: ShowroomLayout) -> "SeatGrid":
+        segments: list[list[tuple[int, int, int]]] = [[] for _ in layout.rows]
+        for row_index, start, end in layout.segments:
+            segments[row_index].append((start, end, layout.seat_nos[start]))
+
+        centers = tuple(
+            (layout.seat_nos[first] + layout.seat_nos[first + count - 1]) / 2
+            for _, first, count in layout.rows
+        )
+        ideal_row = (len(layout.rows) - 1) * SWEET_SPOT
+        order = sorted(((i - ideal_row) ** 2, i) for i in range(len(layout.rows)))
+        return cls(
+            row_order=tuple(order),
+            row_bounds=tuple((first, first + count) for _, first, count in layout.rows),
+            row_segments=tuple(tuple(s) for s in segments),
+            row_centers=centers,
+        )
+
+
+_grids: dict[int, tuple[ShowroomLayout, SeatGrid]] = {}
+
+
+def get_seat_grid(layout: ShowroomLayout) -> SeatGrid:
+    cached = _grids.get(layout.showroom_id)
+    if cached is None or cached[0] is not layout:
+        cached = (layout, SeatGrid.from_layout(layout))
+        _grids[layout.showroom_id] = cached
+    return cached[1]
+
+
+def best_block(layout: ShowroomLayout, states: bytes | bytearray, party_size: int) -> list[int] | None:
+    """Return the ordinals of the best contiguous free block, or None if none fits."""
+    if party_size < 1:
+        return None
+
+    free_run = _free_run(party_size)
+    # a room without any long enough run (ignoring row breaks) cannot fit the party
+    if free_run.search(states) is None:
+        return None
+
+    grid = get_seat_grid(layout)
+    half = (party_size - 1) / 2
+    best_score = float("inf")
+    best_start = -1
+
+    for row_distance, row_index in grid.row_order:
+        if row_distance >= best_score:
+            break
+        center = grid.row_centers[row_index]
+        row_start, row_end = grid.row_bounds[row_index]
+        for run in free_run.finditer(states, row_start, row_end):
+            run_start, run_end = run.span()
+            # a run may cross an aisle; score each segment's part separately
+            for seg_start, seg_end, first_seat_no in grid.row_segments[row_index]:
+                lo = max(run_start, seg_start)
+                hi = min(run_end, seg_end)
+                if hi - lo < party_size:
+                    continue
+                # ordinal whose block would be centred on the row centre
+                ideal = seg_start + round(center - half - first_seat_no)
+                start = min(max(ideal, lo), hi - party_size)
+                offset = first_seat_no + (start - seg_start) + half - center
+                score = row_distance + offset * offset
+                if score < best_score:
+                    best_score = score
+                    best_start = start
+
+    if best_start < 0:
+        return None
+    return list(range(best_start, best_start + party_size))
@@ -0,0 +1,244 @@
+"""
+In-process seat availability cache.
+
+Each cached show keeps one byte per seat of its showroom (indexed by the seat's
+ordinal in the ``ShowroomLayout``), so a seat-map read is a scan over a small
+bytearray instead of two queries. Reserve and checkout update the bitmap in
+place after they commit; a miss rebuilds it from the database.
+
+The cache is per process: with several workers, each one only sees its own
+writes (and its own hold sweeps) until the entry is rebuilt. Entries older than
+``SEAT_CACHE_TTL_SECONDS`` are rebuilt on the next read, and live viewers get a
+fresh snapshot if the rebuild found changes made elsewhere.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.reserved_seats import ReservedSeat
+from app.models.seats import Seat
+from app.models.show import Show
+from app.services.seat_events import publish, resync
+from app.services.seat_layout import ShowroomLayout
+
+SEAT_FREE = 0
+SEAT_HELD = 1
+SEAT_BOOKED = 2
+
+
+@dataclass(slots=True)
+class ShowAvailability:
+    show_id: int
+    layout: ShowroomLayout
+    states: bytearray
+    taken: int
+    # time.monotonic() when the bitmap was read from the database
+    loaded_at: float = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.states) - self.taken
+
+    def snapshot(self) -> list[dict]:
+        layout = self.layout
+        return [
+            {
+                "seats_id": layout.seat_ids[i],
+                "row_no": layout.row_nos[i],
+                "seat_no": layout.seat_nos[i],
+                "state": state,
+            }
+            for i, state in enumerate(self.states)
+        ]
+
+    def available_ordinals(self) -> list[int]:
+        return [i for i, state in enumerate(self.states) if state == SEAT_FREE]
+
+    def set_state(self, seat_id: int, state: int) -> bool:
+        """Update one seat; return False if the seat is not part of this showroom."""
+        ordinal = self.layout.ordinals.get(seat_id)
+        if ordinal is None:
+            return False
+        previous = self.states[ordinal]
+        if (previous == SEAT_FREE) != (state == SEAT_FREE):
+            self.taken += 1 if state != SEAT_FREE else -1
+        self.states[ordinal] = state
+        return True
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+_layouts: dict[int, ShowroomLayout] = {}
+_shows: OrderedDict[int, ShowAvailability] = OrderedDict()
+# shows with a rebuild in flight; a write during the rebuild marks it stale
+_rebuilding: dict[int, int] = {}
+_stale: set[int] = set()
+# called with the show_id after a committed seat change or invalidation
+_listeners: list[Callable[[int], None]] = []
+
+
+def add_listener(listener: Callable[[int], None]) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _touch(show_id: int) -> None:
+    if show_id in _rebuilding:
+        _stale.add(show_id)
+    for listener in _listeners:
+        listener(show_id)
+
+
+def _is_fresh(entry: ShowAvailability) -> bool:
+    return time.monotonic() - entry.loaded_at <= settings.SEAT_CACHE_TTL_SECONDS
+
+
+def _store(entry: ShowAvailability) -> None:
+    _shows[entry.show_id] = entry
+    _shows.move_to_end(entry.show_id)
+    while len(_shows) > settings.SEAT_CACHE_MAX_SHOWS:
+        _shows.popitem(last=False)
+
+
+async def get_showroom_layout(db: AsyncSession, showroom_id: int) -> ShowroomLayout:
+    layout = _layouts.get(showroom_id)
+    if layout is None:
+        rows = await db.execute(
+            select(Seat.seats_id, Seat.row_no, Seat.seat_no).where(Seat.showroom_id == showroom_id)
+        )
+        layout = ShowroomLayout.from_seats(showroom_id, rows.all())
+        _layouts[showroom_id] = layout
+    return layout
+
+
+def cache_showroom_layout(layout: ShowroomLayout) -> None:
+    """Install a layout built from freshly written seats so the first read skips the DB."""
+    invalidate_showroom(layout.showroom_id)
+    _layouts[layout.showroom_id] = layout
+
+
+def peek_show_availability(show_id: int) -> ShowAvailability | None:
+    """Return the cached bitmap for a show without touching the DB; None if absent or expired."""
+    entry = _shows.get(show_id)
+    return entry if entry is not None and _is_fresh(entry) else None
+
+
+async def get_show_availability(db: AsyncSession, show_id: int) -> ShowAvailability | None:
+    """Return the cached bitmap for a show, rebuilding it from the DB on a miss or once expired."""
+    cached = _shows.get(show_id)
+    if cached is not None and _is_fresh(cached):
+        _shows.move_to_end(show_id)
+        return cached
+
+    _rebuilding[show_id] = _rebuilding.get(show_id, 0) + 1
+    try:
+        show = await db.get(Show, show_id)
+        if not show:
+            return None
+
+        layout = await get_showroom_layout(db, show.showroom_id)
+        reserved = await db.execute(
+            select(ReservedSeat.seat_id, ReservedSeat.booking_id, ReservedSeat.expires_at)
+            .where(ReservedSeat.show_id == show_id)
+        )
+        stale = show_id in _stale
+    finally:
+        _rebuilding[show_id] -= 1
+        if not _rebuilding[show_id]:
+            del _rebuilding[show_id]
+            _stale.discard(show_id)
+
+    entry = ShowAvailability(
+        show_id=show_id,
+        layout=layout,
+        states=bytearray(len(layout)),
+        taken=0,
+        loaded_at=time.monotonic(),
+    )
+    now = _utcnow()
+    for seat_id, booking_id, expires_at in reserved.all():
+        if booking_id:
+            entry.set_state(seat_id, SEAT_BOOKED)
+        elif expires_at is None or expires_at > now:
+            entry.set_state(seat_id, SEAT_HELD)
+
+    if not stale:
+        _store(entry)
+        if cached is not None and cached.states != entry.states:
+            # other workers changed seats since the expired entry was built
+            for listener in _listeners:
+                listener(show_id)
+            resync(show_id)
+    return entry
+
+
+def live_reservation():
+    """Reservation rows that still take a seat: bookings and unexpired holds."""
+    return or_(
+        ReservedSeat.booking_id.is_not(None),
+        ReservedSeat.expires_at.is_(None),
+        ReservedSeat.expires_at > _utcnow(),
+    )
+
+
+def show_seat_total():
+    """
+    Seat count of the show's showroom, correlated to ``Show``.
+
+    It counts the showroom's seat rows, the same seats the cached bitmaps hold,
+    so every path that reports a show's total seats agrees.
+    """
+    return (
+        select(func.count(Seat.seats_id))
+        .where(Seat.showroom_id == Show.showroom_id)
+        .correlate(Show)
+        .scalar_subquery()
+    )
+
+
+async def load_seat_counts(db: AsyncSession, *criteria) -> dict[int, tuple[int, int]]:
+    """
+    Return {show_id: (total_seats, reserved)} for the shows matching ``criteria``
+    with one grouped aggregate; expired holds do not count as reserved.
+    """
+    rows = await db.execute(
+        select(Show.show_id, show_seat_total(), func.count(ReservedSeat.reserved_id))
+        .outerjoin(ReservedSeat, and_(ReservedSeat.show_id == Show.show_id, live_reservation()))
+        .where(*criteria)
+        .group_by(Show.show_id, Show.showroom_id)
+    )
+    return {show_id: (total, reserved) for show_id, total, reserved in rows.all()}
+
+
+def mark_seats(show_id: int, seat_ids: Iterable[int], state: int) -> None:
+    """Apply a committed seat change to the cached bitmap and notify live viewers."""
+    seat_ids = list(seat_ids)
+    _touch(show_id)
+    entry = _shows.get(show_id)
+    if entry is not None:
+        for seat_id in seat_ids:
+            entry.set_state(seat_id, state)
+    publish(show_id, seat_ids, state)
+
+
+def invalidate_show(show_id: int) -> None:
+    """Drop the cached bitmap; live viewers reload a snapshot, since no delta describes the change."""
+    _touch(show_id)
+    _shows.pop(show_id, None)
+    resync(show_id)
+
+
+def invalidate_showroom(showroom_id: int) -> None:
+    _layouts.pop(showroom_id, None)
+    for show_id in [s for s, e in _shows.items() if e.layout.showroom_id == showroom_id]:
+        invalidate_show(show_id)
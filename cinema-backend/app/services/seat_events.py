@@ -0,0 +1,76 @@
+"""
+In-process fan-out of seat-state changes to live seat-map viewers.
+
+Each change is serialized once and pushed onto every subscriber queue of the
+show. A viewer that falls too far behind is dropped back to a full snapshot
+instead of letting its queue grow without bound.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from typing import Iterable
+
+# snapshot state names, and the delta event a seat emits when it enters that state
+SNAPSHOT_STATES = {0: "available", 1: "held", 2: "booked"}
+DELTA_EVENTS = {0: "released", 1: "held", 2: "booked"}
+
+# sentinel telling a lagging viewer to resend the whole snapshot
+RESYNC = object()
+
+_QUEUE_SIZE = 256
+
+_subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+
+
+def subscribe(show_id: int) -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    _subscribers[show_id].add(queue)
+    return queue
+
+
+def unsubscribe(show_id: int, queue: asyncio.Queue) -> None:
+    viewers = _subscribers.get(show_id)
+    if viewers is None:
+        return
+    viewers.discard(queue)
+    if not viewers:
+        del _subscribers[show_id]
+
+
+def snapshot_message(show_id: int, seats: list[dict]) -> str:
+    for seat in seats:
+        seat["state"] = SNAPSHOT_STATES[seat["state"]]
+    return json.dumps({"type": "snapshot", "show_id": show_id, "seats": seats})
+
+
+def _request_resync(queue: asyncio.Queue) -> None:
+    # pending deltas are superseded by the snapshot the viewer will receive
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(RESYNC)
+
+
+def resync(show_id: int) -> None:
+    """Make every viewer of the show reload the full snapshot."""
+    for queue in _subscribers.get(show_id, ()):
+        _request_resync(queue)
+
+
+def publish(show_id: int, seat_ids: Iterable[int], state: int) -> None:
+    viewers = _subscribers.get(show_id)
+    if not viewers:
+        return
+
+    message = json.dumps(
+        {
+            "type": "delta",
+            "show_id": show_id,
+            "state": DELTA_EVENTS[state],
+            "seat_ids": sorted(seat_ids),
+        }
+    )
+    for queue in viewers:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            _request_resync(queue)
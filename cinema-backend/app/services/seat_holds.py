@@ -0,0 +1,101 @@
+"""
+Temporary seat holds.
+
+A hold is a ``ReservedSeat`` row without a ``booking_id`` and with an
+``expires_at`` timestamp. Checkout turns the user's holds into booked seats;
+holds that are never checked out are deleted by the background sweeper so
+abandoned carts stop blocking seats.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.models.reserved_seats import ReservedSeat
+from app.services.seat_availability import SEAT_FREE, invalidate_show, mark_seats
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    # expires_at is stored as a naive UTC DATETIME
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def hold_expiry() -> datetime:
+    return utcnow() + timedelta(seconds=settings.SEAT_HOLD_TTL_SECONDS)
+
+
+def is_expired_hold(reservation: ReservedSeat, now: datetime | None = None) -> bool:
+    return (
+        reservation.booking_id is None
+        and reservation.expires_at is not None
+        and reservation.expires_at <= (now or utcnow())
+    )
+
+
+async def release_expired_holds(db: AsyncSession, *, batch_size: int | None = None) -> int:
+    """Delete expired holds in batches and free them in the availability cache."""
+    batch_size = batch_size or settings.SEAT_HOLD_SWEEP_BATCH_SIZE
+    released = 0
+
+    while True:
+        now = utcnow()
+        rows = (
+            await db.execute(
+                select(ReservedSeat.reserved_id, ReservedSeat.show_id, ReservedSeat.seat_id)
+                .where(
+                    ReservedSeat.booking_id.is_(None),
+                    ReservedSeat.expires_at <= now,
+                )
+                .limit(batch_size)
+            )
+        ).all()
+        if not rows:
+            break
+
+        result = await db.execute(
+            delete(ReservedSeat).where(
+                ReservedSeat.reserved_id.in_([r.reserved_id for r in rows]),
+                # a row converted by checkout since the select must survive
+                ReservedSeat.booking_id.is_(None),
+                ReservedSeat.expires_at <= now,
+            )
+        )
+        await db.commit()
+
+        by_show: dict[int, list[int]] = defaultdict(list)
+        for row in rows:
+            by_show[row.show_id].append(row.seat_id)
+        for show_id, seat_ids in by_show.items():
+            if result.rowcount == len(rows):
+                mark_seats(show_id, seat_ids, SEAT_FREE)
+            else:
+                # some rows were checked out meanwhile; reload rather than guess which
+                invalidate_show(show_id)
+
+        released += result.rowcount
+        if len(rows) < batch_size:
+            break
+
+    return released
+
+
+async def run_hold_sweeper() -> None:
+    """Release expired holds forever; started from the app lifespan."""
+    while True:
+        try:
+            async with async_session() as db:
+                released = await release_expired_holds(db)
+            if released:
+                logger.info("Released %d expired seat hold(s)", released)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("Seat hold sweep failed: %s", exc)
+        await asyncio.sleep(settings.SEAT_HOLD_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+
+def row_seat_numbers(seats: int, gaps: Iterable[int] = ()) -> list[int]:
+    """Seat numbers for a row of ``seats`` seats, skipping the ``gaps`` numbers."""
+    skipped = set(gaps)
+    numbers: list[int] = []
+    seat_no = 0
+    while len(numbers) < seats:
+        seat_no += 1
+        if seat_no not in skipped:
+            numbers.append(seat_no)
+    return numbers
+
+
+def _row_sort_key(row_no: str) -> tuple[int, str]:
+    # "B" sorts before "AA" the same way rows are laid out in the room
+    return (len(row_no), row_no)
+
+
+@dataclass(slots=True, frozen=True)
+class ShowroomLayout:
+    """
+    Immutable seat ordering for a showroom.
+
+    Seats are ordered by (row, seat number) and addressed by their ordinal,
+    which is the index used by the per-show availability bitmaps.
+
+    ``rows`` holds (row_no, first ordinal, seat count) per row, and
+    ``segments`` holds (row index, start ordinal, end ordinal) for each run of
+    consecutively numbered seats, so a skipped seat number (an aisle) breaks
+    contiguity.
+    """
+
+    showroom_id: int
+    seat_ids: tuple[int, ...]
+    row_nos: tuple[str, ...]
+    seat_nos: tuple[int, ...]
+    ordinals: dict[int, int]
+    rows: tuple[tuple[str, int, int], ...]
+    segments: tuple[tuple[int, int, int], ...]
+
+    @classmethod
+    def from_seats(
+        cls,
+        showroom_id: int,
+        seats: Iterable[tuple[int, str, int]],
+    ) -> "ShowroomLayout":
+        """Build a layout from (seat_id, row_no, seat_no) tuples."""
+        ordered = sorted(seats, key=lambda s: (_row_sort_key(s[1]), s[2]))
+        seat_ids = tuple(seat_id for seat_id, _, _ in ordered)
+        row_nos = tuple(row_no for _, row_no, _ in ordered)
+        seat_nos = tuple(seat_no for _, _, seat_no in ordered)
+
+        rows: list[tuple[str, int, int]] = []
+        segments: list[tuple[int, int, int]] = []
+        for i, (row_no, seat_no) in enumerate(zip(row_nos, seat_nos)):
+            if not rows or rows[-1][0] != row_no:
+                rows.append((row_no, i, 1))
+                segments.append((len(rows) - 1, i, i + 1))
+                continue
+            rows[-1] = (row_no, rows[-1][1], rows[-1][2] + 1)
+            row_index, start, end = segments[-1]
+            if seat_no == seat_nos[end - 1] + 1:
+                segments[-1] = (row_index, start, end + 1)
+            else:
+                segments.append((row_index, i, i + 1))
+
+        return cls(
+            showroom_id=showroom_id,
+            seat_ids=seat_ids,
+            row_nos=row_nos,
+            seat_nos=seat_nos,
+            ordinals={seat_id: i for i, seat_id in enumerate(seat_ids)},
+            rows=tuple(rows),
+            segments=tuple(segments),
+        )
+
+    def __len__(self) -> int:
+        return len(self.seat_ids)
+
+    def label(self, ordinal: int) -> str:
+        return f"{self.row_nos[ordinal]}{self.seat_nos[ordinal]}"
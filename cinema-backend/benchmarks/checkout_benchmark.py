@@ -0,0 +1,111 @@
+"""
+Per-checkout latency and SQL statement count.
+
+Runs the checkout path (``_create_booking_and_send_email``) repeatedly against
+the database configured in ``.env``, booking free seats of an existing show
+and deleting each booking again afterwards. Every seat is priced as an
+``adult`` ticket, so the prices table needs that row. Run it on two commits
+to compare before/after numbers:
+
+    python -m benchmarks.checkout_benchmark --show-id 12 --user-id 3 --seats 4 --runs 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import BackgroundTasks
+from sqlalchemy import delete, event, select
+
+from app.core.db import async_session, engine
+from app.models.booking import Booking
+from app.models.order_summary import OrderSummary
+from app.models.reserved_seats import ReservedSeat
+from app.models.seats import Seat
+from app.models.show import Show
+from app.core.principals import principal_of
+from app.models.user import User
+from app.routers.booking import _create_booking_and_send_email
+from app.schemas.booking import OrderConfirmationRequest
+
+
+async def _free_seat_ids(show_id: int, count: int) -> list[int]:
+    async with async_session() as db:
+        show = await db.get(Show, show_id)
+        if not show:
+            raise SystemExit(f"Show {show_id} not found")
+        taken = select(ReservedSeat.seat_id).where(ReservedSeat.show_id == show_id)
+        rows = await db.execute(
+            select(Seat.seats_id)
+            .where(Seat.showroom_id == show.showroom_id, Seat.seats_id.not_in(taken))
+            .limit(count)
+        )
+        seat_ids = list(rows.scalars())
+    if len(seat_ids) < count:
+        raise SystemExit(f"Show {show_id} has fewer than {count} free seats")
+    return seat_ids
+
+
+async def _cleanup(booking_id: int) -> None:
+    async with async_session() as db:
+        await db.execute(delete(OrderSummary).where(OrderSummary.booking_id == booking_id))
+        await db.execute(delete(ReservedSeat).where(ReservedSeat.booking_id == booking_id))
+        await db.execute(delete(Booking).where(Booking.booking_id == booking_id))
+        await db.commit()
+
+
+async def main(show_id: int, user_id: int, seats: int, runs: int) -> None:
+    engine.echo = False
+    statements = 0
+
+    def count_statement(*_):
+        nonlocal statements
+        statements += 1
+
+    async with async_session() as db:
+        user = await db.get(User, user_id)
+    if not user:
+        raise SystemExit(f"User {user_id} not found")
+    principal = principal_of(user)
+
+    latencies: list[float] = []
+    counts: list[int] = []
+    for _ in range(runs):
+        payload = OrderConfirmationRequest(
+            user_id=user_id,
+            show_id=show_id,
+            seat_ids=await _free_seat_ids(show_id, seats),
+            ticket_types=["adult"] * seats,
+            creditcard=1,
+        )
+        async with async_session() as db:
+            statements = 0
+            event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+            started = time.perf_counter()
+            try:
+                booking = await _create_booking_and_send_email(payload, BackgroundTasks(), db, principal)
+            finally:
+                elapsed = time.perf_counter() - started
+                event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+            booking_id = booking.booking_id
+        latencies.append(elapsed * 1000)
+        counts.append(statements)
+        await _cleanup(booking_id)
+
+    latencies.sort()
+    print(f"checkouts:          {runs} x {seats} seat(s)")
+    print(f"statements/checkout {statistics.mean(counts):.1f} (+ commit)")
+    print(f"latency mean        {statistics.mean(latencies):.2f} ms")
+    print(f"latency p50         {latencies[len(latencies) // 2]:.2f} ms")
+    print(f"latency p95         {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.2f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--show-id", type=int, required=True)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--seats", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.show_id, args.user_id, args.seats, args.runs))
@@ -0,0 +1,138 @@
+"""
+Concurrent checkout stress harness.
+
+Each round fires ``--concurrency`` checkouts at the same free seats of one show,
+using the given users in turn, then deletes the winning booking. Reports
+throughput, abort rate and latency percentiles for the selected
+CHECKOUT_LOCK_MODE. Seats are priced as ``adult`` tickets:
+
+    python -m benchmarks.checkout_stress --show-id 12 --user-ids 3 4 5 6 \\
+        --seats 2 --concurrency 16 --rounds 25 --mode claim
+
+Keep --concurrency within the engine's connection pool (pool_size +
+max_overflow), otherwise latency includes waiting for a connection.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.db import async_session, engine
+from app.models.booking import Booking
+from app.models.order_summary import OrderSummary
+from app.models.reserved_seats import ReservedSeat
+from app.models.seats import Seat
+from app.models.show import Show
+from app.core.principals import Principal, principal_of
+from app.models.user import User
+from app.routers.booking import _create_booking_and_send_email
+from app.schemas.booking import OrderConfirmationRequest
+
+
+async def _free_seat_ids(show_id: int, count: int) -> list[int]:
+    async with async_session() as db:
+        show = await db.get(Show, show_id)
+        if not show:
+            raise SystemExit(f"Show {show_id} not found")
+        taken = select(ReservedSeat.seat_id).where(ReservedSeat.show_id == show_id)
+        rows = await db.execute(
+            select(Seat.seats_id)
+            .where(Seat.showroom_id == show.showroom_id, Seat.seats_id.not_in(taken))
+            .limit(count)
+        )
+        seat_ids = list(rows.scalars())
+    if len(seat_ids) < count:
+        raise SystemExit(f"Show {show_id} has fewer than {count} free seats")
+    return seat_ids
+
+
+async def _attempt(user: Principal, show_id: int, seat_ids: list[int]) -> tuple[float, int | None]:
+    """Return (latency in seconds, booking id or None if the checkout aborted)."""
+    payload = OrderConfirmationRequest(
+        user_id=user.user_id,
+        show_id=show_id,
+        seat_ids=seat_ids,
+        ticket_types=["adult"] * len(seat_ids),
+        creditcard=1,
+    )
+    started = time.perf_counter()
+    async with async_session() as db:
+        try:
+            booking = await _create_booking_and_send_email(payload, BackgroundTasks(), db, user)
+        except HTTPException as exc:
+            if exc.status_code != 409:
+                raise
+            return time.perf_counter() - started, None
+    return time.perf_counter() - started, booking.booking_id
+
+
+async def main(
+    show_id: int,
+    user_ids: list[int],
+    seats: int,
+    concurrency: int,
+    rounds: int,
+    mode: str,
+) -> None:
+    engine.echo = False
+    settings.CHECKOUT_LOCK_MODE = mode
+
+    async with async_session() as db:
+        users = [
+            principal_of(user)
+            for user in (await db.execute(select(User).where(User.user_id.in_(user_ids)))).scalars().all()
+        ]
+    if len(users) != len(set(user_ids)):
+        raise SystemExit("One or more users were not found")
+
+    latencies: list[float] = []
+    committed = aborted = 0
+    wall = 0.0
+    for _ in range(rounds):
+        seat_ids = await _free_seat_ids(show_id, seats)
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(_attempt(users[i % len(users)], show_id, seat_ids) for i in range(concurrency))
+        )
+        wall += time.perf_counter() - started
+
+        booking_ids = [booking_id for _, booking_id in results if booking_id is not None]
+        latencies.extend(latency * 1000 for latency, _ in results)
+        committed += len(booking_ids)
+        aborted += len(results) - len(booking_ids)
+
+        async with async_session() as db:
+            await db.execute(delete(OrderSummary).where(OrderSummary.booking_id.in_(booking_ids)))
+            await db.execute(delete(ReservedSeat).where(ReservedSeat.booking_id.in_(booking_ids)))
+            await db.execute(delete(Booking).where(Booking.booking_id.in_(booking_ids)))
+            await db.commit()
+
+    attempts = committed + aborted
+    latencies.sort()
+    print(f"mode                {mode}")
+    print(f"attempts            {attempts} ({rounds} rounds x {concurrency} concurrent, {seats} seat(s))")
+    print(f"committed           {committed}")
+    print(f"abort rate          {aborted / attempts:.1%}")
+    print(f"throughput          {attempts / wall:.1f} checkouts/s ({committed / wall:.1f} committed/s)")
+    print(f"latency p50         {latencies[len(latencies) // 2]:.2f} ms")
+    print(f"latency p99         {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:.2f} ms")
+    print(f"latency mean        {statistics.mean(latencies):.2f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--show-id", type=int, required=True)
+    parser.add_argument("--user-ids", type=int, nargs="+", required=True)
+    parser.add_argument("--seats", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=25)
+    parser.add_argument("--mode", choices=["claim", "optimistic"], default=settings.CHECKOUT_LOCK_MODE)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.show_id, args.user_ids, args.seats, args.concurrency, args.rounds, args.mode)
+    )
@@ -0,0 +1,74 @@
+"""
+Movie search index latency on a synthetic catalog.
+
+Pure in-memory: builds ``--movies`` movies from a random vocabulary (names of
+2-4 words, a genre and a ~40 word description), then times ``SearchIndex.search``
+for type-ahead prefixes of growing length, full words and multi-word queries:
+
+    python -m benchmarks.movie_search_benchmark --movies 5000
+"""
+import argparse
+import random
+import string
+import time
+import timeit
+
+from app.schemas.movie import MovieRead
+from app.services.movie_search import SearchIndex
+
+GENRES = ["Action", "Comedy", "Drama", "Horror", "Romance", "Sci-Fi", "Thriller", "Animation", "Documentary"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def build_movies(count: int, vocab_size: int, rng: random.Random) -> dict[int, MovieRead]:
+    vocab = [_word(rng) for _ in range(vocab_size)]
+    movies = {}
+    for movie_id in range(1, count + 1):
+        movies[movie_id] = MovieRead(
+            movie_id=movie_id,
+            name=" ".join(rng.choice(vocab).title() for _ in range(rng.randint(2, 4))),
+            description=" ".join(rng.choice(vocab) for _ in range(40)),
+            rating="PG-13",
+            runtime=120,
+            release_date=None,
+            available=True,
+            poster=None,
+            trailer=None,
+            main_genre=rng.choice(GENRES),
+        )
+    return movies
+
+
+def main(movies: int, vocab_size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    catalog = build_movies(movies, vocab_size, rng)
+
+    started = time.perf_counter()
+    index = SearchIndex.build(catalog)
+    print(f"catalog             {movies} movies, build {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    names = [movie.name.lower().split() for movie in catalog.values()]
+    queries = {
+        "1-char prefix": [words[0][:1] for words in names[:200]],
+        "3-char prefix": [words[0][:3] for words in names[:200]],
+        "full word": [words[0] for words in names[:200]],
+        "two words": [" ".join(words[:2]) for words in names[:200]],
+        "word + prefix": [f"{words[0]} {words[1][:2]}" for words in names[:200]],
+    }
+    for label, batch in queries.items():
+        number = 5
+        total = min(timeit.repeat(lambda: [index.search(q) for q in batch], number=number, repeat=5))
+        per_query = total / (number * len(batch)) * 1e6
+        print(f"{label:<19} {per_query:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--vocab-size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=4050)
+    args = parser.parse_args()
+    main(args.movies, args.vocab_size, args.seed)
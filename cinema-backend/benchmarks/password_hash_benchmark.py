@@ -0,0 +1,78 @@
+"""
+Event-loop latency during a login flood.
+
+Fires ``--logins`` concurrent bcrypt password checks while a probe task wakes
+every ``--tick-ms`` and records how late each wake-up is, which is how long any
+other request on the worker would wait. Runs the inline ``verify_password``
+and the pooled ``verify_password_async`` back to back. Needs no database:
+
+    python -m benchmarks.password_hash_benchmark --logins 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.security import PasswordHashBusy, get_password_hash, verify_password, verify_password_async
+
+
+async def _probe(tick: float, lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + tick
+        await asyncio.sleep(tick)
+        lags.append(max(time.perf_counter() - expected, 0.0) * 1000)
+
+
+async def _inline_login(password: str, hashed: str) -> bool:
+    await asyncio.sleep(0)
+    return verify_password(password, hashed)
+
+
+async def _pooled_login(password: str, hashed: str) -> bool:
+    try:
+        return await verify_password_async(password, hashed)
+    except PasswordHashBusy:
+        return False
+
+
+async def _flood(login, logins: int, tick: float, hashed: str) -> tuple[float, list[float], int]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(tick, lags, stop))
+    await asyncio.sleep(tick * 3)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login("correct horse", hashed) for _ in range(logins)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await probe
+    return wall, lags, sum(1 for ok in results if not ok)
+
+
+def _report(label: str, logins: int, wall: float, lags: list[float], failed: int) -> None:
+    lags = sorted(lags)
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{label:<8} {logins / wall:7.1f} logins/s  rejected {failed:4d}  "
+        f"loop lag p50 {statistics.median(lags):8.1f} ms  p99 {p99:8.1f} ms  max {lags[-1]:8.1f} ms"
+    )
+
+
+async def main(logins: int, tick_ms: float) -> None:
+    hashed = get_password_hash("correct horse")
+    tick = tick_ms / 1000
+    print(
+        f"{logins} concurrent logins, probe every {tick_ms:g} ms, "
+        f"pool {settings.PASSWORD_HASH_WORKERS} workers + {settings.PASSWORD_HASH_QUEUE_LIMIT} queued"
+    )
+    for label, login in (("inline", _inline_login), ("pooled", _pooled_login)):
+        wall, lags, failed = await _flood(login, logins, tick, hashed)
+        _report(label, logins, wall, lags, failed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--tick-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.tick_ms))
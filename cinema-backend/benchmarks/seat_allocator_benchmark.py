@@ -0,0 +1,71 @@
+"""
+Best-available allocator latency on a large, nearly full showroom.
+
+Pure in-memory: builds a synthetic room (20 rows x 25 seats with two aisles by
+default), fills it to the requested occupancy at random and times
+``best_block`` for party sizes 1-8:
+
+    python -m benchmarks.seat_allocator_benchmark --rows 20 --seats-per-row 25 --occupancy 0.95
+"""
+import argparse
+import random
+import string
+import timeit
+
+from app.services.seat_allocator import best_block, get_seat_grid
+from app.services.seat_layout import ShowroomLayout
+
+
+def build_layout(rows: int, seats_per_row: int, aisles: tuple[int, ...]) -> ShowroomLayout:
+    seats = []
+    seat_id = 1
+    for r in range(rows):
+        row_no = string.ascii_uppercase[r % 26] * (r // 26 + 1)
+        seat_no = 0
+        for n in range(seats_per_row):
+            seat_no += 1
+            if n in aisles:
+                seat_no += 1  # skipped number marks the aisle
+            seats.append((seat_id, row_no, seat_no))
+            seat_id += 1
+    return ShowroomLayout.from_seats(1, seats)
+
+
+def main(rows: int, seats_per_row: int, occupancy: float, samples: int, seed: int) -> None:
+    rng = random.Random(seed)
+    width = seats_per_row
+    layout = build_layout(rows, seats_per_row, (width // 4, width - width // 4))
+    get_seat_grid(layout)  # precomputed once per showroom, not per request
+
+    taken = int(len(layout) * occupancy)
+    maps = []
+    for _ in range(samples):
+        states = bytearray(len(layout))
+        for i in rng.sample(range(len(layout)), taken):
+            states[i] = 2
+        maps.append(states)
+
+    print(f"room                {len(layout)} seats, {rows} rows, {occupancy:.0%} occupied, {samples} seat maps")
+    for party_size in range(1, 9):
+        found = sum(best_block(layout, states, party_size) is not None for states in maps)
+        number = 20
+        total = min(
+            timeit.repeat(
+                lambda: [best_block(layout, states, party_size) for states in maps],
+                number=number,
+                repeat=5,
+            )
+        )
+        per_call = total / (number * len(maps)) * 1e6
+        print(f"party of {party_size}          {per_call:7.2f} us/call  (block found in {found}/{len(maps)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--seats-per-row", type=int, default=25)
+    parser.add_argument("--occupancy", type=float, default=0.95)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=4050)
+    args = parser.parse_args()
+    main(args.rows, args.seats_per_row, args.occupancy, args.samples, args.seed)
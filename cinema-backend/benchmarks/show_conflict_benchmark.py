@@ -0,0 +1,129 @@
+"""
+Show-creation latency as schedule history grows.
+
+Fills an existing showroom with synthetic history (``--per-day`` back-to-back
+shows per day for each of ``--years``), then times ``create_show`` for new
+slots right after that history, next to the old approach of loading every
+show in the showroom and checking overlap in Python. History is placed from
+``--start`` (default year 2200) so it never collides with the real schedule,
+and everything the script inserts is deleted again afterwards:
+
+    python -m benchmarks.show_conflict_benchmark --showroom-id 1 --movie-id 1 --years 0 1 3 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, insert, select
+
+from app.core.db import async_session, engine
+from app.models.booking import Booking  # noqa: F401  (configures ReservedSeat.booking)
+from app.models.show import Show
+from app.routers.show import create_show
+from app.schemas.show import ShowCreate
+from app.services.scheduling import overlaps, show_end
+
+DURATION = 120
+
+
+async def _fill_history(showroom_id: int, movie_id: int, start: datetime, days: int, per_day: int) -> int:
+    rows = [
+        {
+            "movieid": movie_id,
+            "showroom_id": showroom_id,
+            "date_time": start + timedelta(days=day, minutes=slot * DURATION),
+            "duration": DURATION,
+        }
+        for day in range(days)
+        for slot in range(per_day)
+    ]
+    async with async_session() as db:
+        for i in range(0, len(rows), 1000):
+            await db.execute(insert(Show).values(rows[i:i + 1000]))
+        await db.commit()
+    return len(rows)
+
+
+async def _full_scan_conflict(db, payload: ShowCreate) -> bool:
+    # the pre-index implementation, kept here for comparison
+    existing = (await db.execute(select(Show).where(Show.showroom_id == payload.showroom_id))).scalars().all()
+    end = show_end(payload.date_time, payload.duration)
+    return any(
+        overlaps(payload.date_time, end, s.date_time, show_end(s.date_time, s.duration)) for s in existing
+    )
+
+
+async def _time_creates(showroom_id: int, movie_id: int, first_slot: datetime, creates: int):
+    statements = 0
+
+    def count_statement(*_):
+        nonlocal statements
+        statements += 1
+
+    indexed: list[float] = []
+    full_scan: list[float] = []
+    counts: list[int] = []
+    for i in range(creates):
+        payload = ShowCreate(
+            movieid=movie_id,
+            showroom_id=showroom_id,
+            date_time=first_slot + timedelta(minutes=i * DURATION),
+            duration=DURATION,
+        )
+        async with async_session() as db:
+            started = time.perf_counter()
+            await _full_scan_conflict(db, payload)
+            full_scan.append((time.perf_counter() - started) * 1000)
+
+        async with async_session() as db:
+            statements = 0
+            event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+            started = time.perf_counter()
+            try:
+                await create_show(payload, db)
+            finally:
+                indexed.append((time.perf_counter() - started) * 1000)
+                event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+            counts.append(statements)
+    return indexed, full_scan, counts
+
+
+async def main(showroom_id: int, movie_id: int, years: list[int], per_day: int, creates: int, start: datetime) -> None:
+    engine.echo = False
+    print(f"{'history':>10} {'create p50':>12} {'create p95':>12} {'stmts':>6} {'full scan p50':>14}")
+    try:
+        for year_count in years:
+            history_start = start - timedelta(days=365 * year_count)
+            history = await _fill_history(showroom_id, movie_id, history_start, 365 * year_count, per_day)
+            indexed, full_scan, counts = await _time_creates(showroom_id, movie_id, start, creates)
+            indexed.sort()
+            full_scan.sort()
+            print(
+                f"{history:>10} {indexed[len(indexed) // 2]:>9.2f} ms "
+                f"{indexed[min(len(indexed) - 1, int(len(indexed) * 0.95))]:>9.2f} ms "
+                f"{statistics.mean(counts):>6.1f} {full_scan[len(full_scan) // 2]:>11.2f} ms"
+            )
+            await _cleanup(showroom_id, history_start)
+    finally:
+        await _cleanup(showroom_id, start - timedelta(days=365 * max(years)))
+        await engine.dispose()
+
+
+async def _cleanup(showroom_id: int, since: datetime) -> None:
+    async with async_session() as db:
+        await db.execute(delete(Show).where(Show.showroom_id == showroom_id, Show.date_time >= since))
+        await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--showroom-id", type=int, required=True)
+    parser.add_argument("--movie-id", type=int, required=True)
+    parser.add_argument("--years", type=int, nargs="+", default=[0, 1, 3, 5])
+    parser.add_argument("--per-day", type=int, default=5)
+    parser.add_argument("--creates", type=int, default=50)
+    parser.add_argument("--start", type=datetime.fromisoformat, default=datetime(2200, 1, 1))
+    args = parser.parse_args()
+    asyncio.run(main(args.showroom_id, args.movie_id, args.years, args.per_day, args.creates, args.start))
@@ -0,0 +1,7 @@
+-- Temporary seat holds: reserved_seats rows without a booking expire.
+ALTER TABLE reserved_seats
+    ADD COLUMN expires_at DATETIME NULL,
+    ADD INDEX ix_reserved_seats_expires_at (expires_at);
+
+-- Pre-existing holds never expired; let the sweeper release them.
+UPDATE reserved_seats SET expires_at = UTC_TIMESTAMP() WHERE booking_id IS NULL;
@@ -0,0 +1,21 @@
+-- Denormalized order history, written by checkout alongside each booking.
+CREATE TABLE order_summaries (
+    booking_id INT NOT NULL PRIMARY KEY,
+    user_id INT NOT NULL,
+    show_id INT NOT NULL,
+    total_amount FLOAT NOT NULL,
+    created_at DATETIME NOT NULL,
+    movie_name VARCHAR(255) NULL,
+    showroom_name VARCHAR(45) NULL,
+    show_time DATETIME NULL,
+    seat_labels JSON NOT NULL,
+    reserved_seats JSON NOT NULL,
+    INDEX ix_order_summaries_user_booking (user_id, booking_id),
+    CONSTRAINT fk_order_summaries_booking FOREIGN KEY (booking_id)
+        REFERENCES booking (booking_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    CONSTRAINT fk_order_summaries_user FOREIGN KEY (user_id)
+        REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- Existing bookings are filled in afterwards with:
+--   python -m app.services.order_summaries
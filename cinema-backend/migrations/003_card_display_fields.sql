@@ -0,0 +1,7 @@
+-- Plain-text display fields so card listings need no decryption.
+ALTER TABLE cards
+    ADD COLUMN last_four VARCHAR(4) NULL,
+    ADD COLUMN brand VARCHAR(20) NULL;
+
+-- Numbers are Fernet-encrypted, so existing cards are filled in afterwards with:
+--   python -m app.services.cards
@@ -0,0 +1,13 @@
+-- Bumped whenever a user's tokens must stop working (password or state change).
+ALTER TABLE users
+    ADD COLUMN token_version INT NOT NULL DEFAULT 0;
+
+-- Issued, unused refresh tokens; /auth/refresh deletes the row it redeems.
+CREATE TABLE refresh_tokens (
+    jti VARCHAR(36) NOT NULL PRIMARY KEY,
+    user_id INT NOT NULL,
+    expires_at DATETIME NOT NULL,
+    INDEX ix_refresh_tokens_user_id (user_id),
+    CONSTRAINT fk_refresh_tokens_user FOREIGN KEY (user_id)
+        REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
@@ -0,0 +1,31 @@
+import pytest
+
+from app.core.security import card_brand, card_last_four
+
+
+@pytest.mark.parametrize(
+    ("number", "brand"),
+    [
+        ("4111 1111 1111 1111", "visa"),
+        ("5500-0000-0000-0004", "mastercard"),
+        ("2221000000000009", "mastercard"),
+        ("378282246310005", "amex"),
+        ("6011111111111117", "discover"),
+        ("30569309025904", "diners"),
+        ("3530111333300000", "jcb"),
+        ("9999000000000000", None),
+        ("", None),
+    ],
+)
+def test_card_brand(number, brand):
+    assert card_brand(number) == brand
+
+
+def test_card_last_four_ignores_separators():
+    assert card_last_four("4111 1111 1111 1234") == "1234"
+    assert card_last_four("5500-0000-0000-0004") == "0004"
+
+
+def test_card_last_four_needs_four_digits():
+    assert card_last_four("12 3") is None
+    assert card_last_four("") is None
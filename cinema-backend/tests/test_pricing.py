@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+import pytest
+
+from app.services.pricing import PricingError, QuoteLine, price_tickets
+
+TABLE = {"adult": Decimal("12.50"), "child": Decimal("8.00"), "senior": Decimal("9.99")}
+
+
+def test_groups_lines_by_type_case_insensitively():
+    quote = price_tickets(TABLE, ["Adult", "child", "adult"])
+    assert quote.lines == (
+        QuoteLine("adult", 2, Decimal("12.50"), Decimal("25.00")),
+        QuoteLine("child", 1, Decimal("8.00"), Decimal("8.00")),
+    )
+    assert quote.subtotal == quote.total == Decimal("33.00")
+    assert quote.discount == Decimal("0.00")
+
+
+def test_discount_rounds_half_up_to_cents():
+    quote = price_tickets(TABLE, ["senior"], discount_percent=15, promo_code="SPRING")
+    # 9.99 * 15% = 1.4985
+    assert quote.discount == Decimal("1.50")
+    assert quote.total == Decimal("8.49")
+    assert quote.promo_code == "SPRING"
+
+
+def test_total_never_negative():
+    assert price_tickets(TABLE, ["child"], discount_percent=150).total == Decimal("0")
+
+
+def test_unknown_ticket_type_is_rejected():
+    with pytest.raises(PricingError, match="vip"):
+        price_tickets(TABLE, ["adult", "VIP"])
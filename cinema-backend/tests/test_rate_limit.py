@@ -0,0 +1,42 @@
+import pytest
+
+from app.core.rate_limit import TokenBucket
+
+
+def drain(bucket: TokenBucket, key: str, now: float) -> int:
+    allowed = 0
+    while bucket.retry_after(key, now) == 0:
+        bucket.consume(key, now)
+        allowed += 1
+    return allowed
+
+
+def test_allows_burst_then_refills_at_rate():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=3)
+    assert drain(bucket, "a", 100.0) == 3
+    assert bucket.retry_after("a", 100.0) == pytest.approx(1.0)
+    assert bucket.retry_after("a", 100.5) == pytest.approx(0.5)
+    assert drain(bucket, "a", 101.0) == 1
+
+
+def test_keys_are_independent():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=1)
+    bucket.consume("a", 100.0)
+    assert bucket.retry_after("a", 100.0) > 0
+    assert bucket.retry_after("b", 100.0) == 0
+
+
+def test_idle_key_refills_to_burst_only():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=2)
+    drain(bucket, "a", 100.0)
+    assert drain(bucket, "a", 1000.0) == 2
+
+
+def test_compact_forgets_refilled_keys():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=2)
+    bucket.consume("a", 100.0)
+    bucket.consume("b", 105.0)
+    bucket.compact(102.0)
+    assert bucket.stats() == {"allowed": 2, "rejected": 0, "tracked_keys": 1}
+    bucket.reset()
+    assert bucket.stats() == {"allowed": 0, "rejected": 0, "tracked_keys": 0}
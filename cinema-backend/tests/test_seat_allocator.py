@@ -0,0 +1,53 @@
+from app.services.seat_allocator import best_block
+from app.services.seat_layout import ShowroomLayout
+
+TAKEN = 1
+
+
+def make_layout(rows: dict[str, list[int]]) -> ShowroomLayout:
+    seats = []
+    for row_no, seat_nos in rows.items():
+        for seat_no in seat_nos:
+            seats.append((len(seats) + 1, row_no, seat_no))
+    return ShowroomLayout.from_seats(1, seats)
+
+
+def labels(layout: ShowroomLayout, ordinals: list[int] | None) -> list[str] | None:
+    return None if ordinals is None else [layout.label(i) for i in ordinals]
+
+
+def test_centres_block_in_sweet_spot_row():
+    layout = make_layout({row: list(range(1, 8)) for row in "ABCDEF"})
+    states = bytes(len(layout))
+    # sweet spot is 60% of the way back: row index 3 of 0..5
+    assert labels(layout, best_block(layout, states, 3)) == ["D3", "D4", "D5"]
+
+
+def test_shifts_block_around_taken_seats():
+    layout = make_layout({"A": list(range(1, 8))})
+    states = bytearray(len(layout))
+    states[layout.ordinals[3]] = TAKEN
+    assert labels(layout, best_block(layout, states, 2)) == ["A4", "A5"]
+
+
+def test_block_does_not_cross_aisle():
+    # seat number 4 is an aisle, so 3 and 5 are not adjacent
+    layout = make_layout({"A": [1, 2, 3, 5, 6, 7]})
+    states = bytearray(len(layout))
+    states[layout.ordinals[1]] = states[layout.ordinals[6]] = TAKEN
+    assert best_block(layout, states, 3) is None
+    assert labels(layout, best_block(layout, states, 2)) == ["A2", "A3"]
+
+
+def test_block_does_not_cross_rows():
+    layout = make_layout({"A": [1, 2, 3], "B": [1, 2, 3]})
+    states = bytearray(len(layout))
+    states[layout.ordinals[1]] = states[layout.ordinals[6]] = TAKEN
+    assert best_block(layout, states, 3) is None
+
+
+def test_none_when_party_does_not_fit():
+    layout = make_layout({"A": [1, 2, 3]})
+    assert best_block(layout, bytes(len(layout)), 4) is None
+    assert best_block(layout, bytes([TAKEN] * len(layout)), 1) is None
+    assert best_block(layout, bytes(len(layout)), 0) is None
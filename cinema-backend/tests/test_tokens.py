@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from app.core import tokens
+
+
+@pytest.fixture(autouse=True)
+def clear_revocations():
+    tokens.clear()
+    yield
+    tokens.clear()
+
+
+def test_nothing_revoked_by_default():
+    assert not tokens.is_revoked(1, time.time())
+    assert not tokens.is_revoked(1, None)
+
+
+def test_revoke_refuses_only_earlier_tokens_of_that_user():
+    tokens.revoke_tokens(1)
+    now = time.time()
+    assert tokens.is_revoked(1, now - 10)
+    assert not tokens.is_revoked(1, now + 10)
+    assert not tokens.is_revoked(2, now - 10)
+
+
+def test_token_without_issue_time_is_revoked():
+    tokens.revoke_tokens(1)
+    assert tokens.is_revoked(1, None)
+
+
+def test_clear_forgets_revocations():
+    tokens.revoke_tokens(1)
+    tokens.clear()
+    assert not tokens.is_revoked(1, None)
@@ -89,7 +89,6 @@ export default function CheckoutPage() {
     const [userHasAddress, setUserHasAddress] = useState(false);
     const [promoCode, setPromoCode] = useState("");
     const [promo, setPromo] = useState<ApiPromotion | null>(null);
-    const [appliedCode, setAppliedCode] = useState<string | null>(null);
     const [promoError, setPromoError] = useState<string | null>(null);
     const [promoLoading, setPromoLoading] = useState(false);
     const [paymentOption, setPaymentOption] = useState<PaymentOptionId>("saved1");
@@ -176,39 +175,27 @@ export default function CheckoutPage() {
     const datePretty = formatPrettyDate(booking?.date);
     const timePretty = formatTimeOnly(booking?.showtime);
 
+    // estimate only: checkout prices the order on the server and rejects a
+    // total that no longer matches
     let discount = 0;
     if (promo && baseTotal > 0) {
-        discount = (promo.discount / 100) * baseTotal;
+        discount = Math.round(promo.discount * baseTotal) / 100;
         if (discount > baseTotal) discount = baseTotal;
-    } else if (appliedCode === "SAVE10") {
-        discount = Math.min(baseTotal * 0.1, baseTotal);
-    } else if (appliedCode === "FIVEOFF") {
-        discount = Math.min(5, baseTotal);
     }
 
-    const finalTotal = baseTotal - discount;
+    const finalTotal = Math.round((baseTotal - discount) * 100) / 100;
 
     const applyPromo = async () => {
         const code = promoCode.trim().toUpperCase();
         if (!code) {
             setPromoError("Please enter a promo code.");
             setPromo(null);
-            setAppliedCode(null);
-            return;
-        }
-
-        if (code === "SAVE10" || code === "FIVEOFF") {
-            setAppliedCode(code);
-            setPromo(null);
-            setPromoError(null);
-            setPromoLoading(false);
             return;
         }
 
         setPromoLoading(true);
         setPromoError(null);
         setPromo(null);
-        setAppliedCode(null);
 
         try {
             const res = await fetch(
@@ -257,6 +244,17 @@ export default function CheckoutPage() {
             return;
         }
 
+        // one ticket type per seat; the server prices the order from these
+        const ticketTypes = [
+            ...Array(adults).fill("adult"),
+            ...Array(children).fill("child"),
+            ...Array(seniors).fill("senior"),
+        ];
+        if (ticketTypes.length !== seats.length) {
+            alert("The number of tickets does not match the selected seats.");
+            return;
+        }
+
         const token =
             authToken ||
             localStorage.getItem("auth_token") ||
@@ -399,6 +397,8 @@ export default function CheckoutPage() {
                     user_id: userIdNum,
                     show_id: showIdNum,
                     seat_ids: seatIds,
+                    ticket_types: ticketTypes,
+                    promo_code: promo?.code ?? null,
                     total_amount: finalTotal,
                     creditcard: cardIdToUse,
                 }),
@@ -409,13 +409,15 @@ export default function CheckoutPage() {
                 throw new Error(text || "Failed to place order.");
             }
 
+            const order = await checkoutRes.json();
+
             // Save booking summary for order confirmation
             localStorage.setItem(
                 "booking_summary",
                 JSON.stringify({
                     ...booking,
-                    discountedTotal: finalTotal,
-                    promoUsed: appliedCode || promo?.code || null,
+                    discountedTotal: order.total_amount,
+                    promoUsed: promo?.code || null,
                     seats,
                     baseTotal,
                     discount,
@@ -574,9 +576,9 @@ export default function CheckoutPage() {
                             </p>
                         )}
 
-                        {appliedCode && !promoError && !promo && (
+                        {promo && !promoError && (
                             <p style={{ color: "green", marginTop: "5px" }}>
-                                Promo {appliedCode} applied!
+                                Promo {promo.code} applied!
                             </p>
                         )}
                     </div>
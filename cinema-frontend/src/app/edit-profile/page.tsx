@@ -129,6 +129,11 @@ export default function EditProfilePage() {
       });
 
       if (res.ok) {
+        // a password change revokes the old token; keep the replacement
+        const updated = await res.json();
+        if (updated.access_token) {
+          localStorage.setItem("auth_token", updated.access_token);
+        }
         alert("Profile updated successfully!");
         router.push("/profile");
       } else {